@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import warnings
-from pathlib import Path
 
 __logo__ = "🐈"
 
@@ -30,40 +29,9 @@ except Exception:
     )
 
 
-def _version_from_pyproject() -> str | None:
-    try:
-        import tomllib  # py311+
-    except Exception:
-        return None
-
-    # Repo layout: <root>/pyproject.toml and <root>/nanobot/__init__.py.
-    root = Path(__file__).resolve().parent.parent
-    pyproject = root / "pyproject.toml"
-    if not pyproject.exists():
-        return None
-
-    try:
-        data = tomllib.loads(pyproject.read_text(encoding="utf-8", errors="replace"))
-        project = data.get("project") if isinstance(data, dict) else None
-        v = project.get("version") if isinstance(project, dict) else None
-        return str(v) if v else None
-    except Exception:
-        return None
-
-
-def _get_version() -> str:
-    # Prefer installed package metadata when available, otherwise fall back to pyproject.toml
-    # (useful in editable/source checkouts).
-    try:
-        from importlib.metadata import PackageNotFoundError, version
-
-        # Distribution name in pyproject.toml is "nanobot-ai".
-        try:
-            return version("nanobot-ai")
-        except PackageNotFoundError:
-            return version("nanobot")
-    except Exception:
-        return _version_from_pyproject() or "0.0.0"
-
-
-__version__ = _get_version()
+# The version is a literal in _version.py (also the hatchling version source), which
+# avoids importing importlib.metadata on every startup.
+try:
+    from nanobot._version import __version__
+except ImportError:  # pragma: no cover - broken/partial checkout
+    __version__ = "0.0.0"
@@ -0,0 +1,3 @@
+"""Package version (single source of truth, read by hatchling at build time)."""
+
+__version__ = "0.1.3.post4"
@@ -1,132 +1,130 @@
 """Context builder for assembling agent prompts."""
 
-import base64
-import mimetypes
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+from itertools import islice
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from loguru import logger
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
 
-from nanobot.agent.memory import MemoryStore
-from nanobot.agent.memory_db import MemoryDB
-from nanobot.agent.skills import SkillsLoader
+    from nanobot.agent.memory import MemoryStore
+    from nanobot.agent.memory_db import MemoryDB
 
+# Heavier dependencies (loguru, sqlite-backed memory, base64 for media) are
+# imported where they are used so that importing this module stays cheap.
 
-class ContextBuilder:
-    """
-    Builds the context (system prompt + messages) for the agent.
 
-    Assembles bootstrap files, memory, skills, and conversation history
-    into a coherent prompt for the LLM.
-    """
+_PROMPT_EXECUTOR: ThreadPoolExecutor | None = None
 
-    BOOTSTRAP_FILES = ["AGENTS.md", "SOUL.md", "USER.md", "TOOLS.md", "IDENTITY.md"]
 
-    def __init__(
-        self,
-        workspace: Path,
-        memory_max_chars: int = 6000,
-        skills_max_chars: int = 12000,
-        bootstrap_max_chars: int = 4000,
-        history_max_chars: int = 80000,
-    ):
-        self.workspace = workspace
-        self.skills = SkillsLoader(workspace)
-        self.memory_max_chars = max(int(memory_max_chars), 0)
-        self.skills_max_chars = max(int(skills_max_chars), 0)
-        self.bootstrap_max_chars = max(int(bootstrap_max_chars), 0)
-        self.history_max_chars = max(int(history_max_chars), 0)
-        self._cache: dict[str, tuple[tuple, str]] = {}
-        self._memory_db: MemoryDB | None = None
+def _prompt_executor() -> ThreadPoolExecutor:
+    """Shared pool for loading prompt sections concurrently (stat/read/SQLite release the GIL)."""
+    global _PROMPT_EXECUTOR
+    if _PROMPT_EXECUTOR is None:
+        from concurrent.futures import ThreadPoolExecutor
 
-    @property
-    def memory_db(self) -> MemoryDB:
-        if self._memory_db is None:
-            self._memory_db = MemoryDB(self.workspace / "memory" / "memory.sqlite3")
-        return self._memory_db
+        _PROMPT_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="nanobot-prompt")
+    return _PROMPT_EXECUTOR
 
-    def build_system_prompt(
-        self,
-        skill_names: list[str] | None = None,
-        *,
-        session_key: str | None = None,
-        memory_scope: str = "session",
-        memory_key: str | None = None,
-        current_message: str = "",
-        history: list[dict[str, Any]] | None = None,
-    ) -> str:
-        """
-        Build the system prompt from bootstrap files, memory, and skills.
 
-        Args:
-            skill_names: Optional list of skills to include.
-            session_key: Optional session key used for memory scoping.
-            current_message: Current user message (used to retrieve relevant memories).
-            history: Optional recent history (used to retrieve relevant memories).
+def _mtime_sig(paths: Iterable[str | Path], *extra: object) -> bytes:
+    """
+    Fold (path, mtime_ns) of each file, plus any extra values, into a 16-byte digest.
 
-        Returns:
-            Complete system prompt.
-        """
-        parts = []
+    Missing files hash with mtime -1, so appearing/disappearing files change the digest.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for p in paths:
+        name = os.fspath(p)
+        h.update(name.encode("utf-8", errors="surrogatepass"))
+        h.update(struct.pack("<q", _stat_mtime_ns(name)))
+    for value in extra:
+        h.update(repr(value).encode("utf-8", errors="surrogatepass"))
+    return h.digest()
 
-        # Core identity (always fresh for current time)
-        if memory_key is None and memory_scope == "session":
-            memory_key = session_key
-        parts.append(
-            self._get_identity(
-                session_key=session_key,
-                memory_scope=memory_scope,
-                memory_key=memory_key,
-            )
-        )
 
-        bootstrap = self._get_bootstrap_content()
-        if bootstrap:
-            parts.append(bootstrap)
+# Flattens retrieved memory hits onto one bullet line in a single pass.
+_NL_TRANS = str.maketrans({"\n": " ", "\r": " ", "\t": " "})
 
-        memory_section = self._get_memory_section(
-            session_key=session_key,
-            memory_scope=memory_scope,
-            memory_key=memory_key,
-            current_message=current_message,
-            history=history or [],
-        )
-        if memory_section:
-            parts.append(memory_section)
 
-        skills_section = self._get_skills_section(skill_names=skill_names)
-        if skills_section:
-            parts.append(skills_section)
+def _stat_mtime_ns(path: str | Path) -> int:
+    """mtime in nanoseconds, or -1 if the file doesn't exist (or can't be stat'ed)."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return -1
 
-        return "\n\n---\n\n".join(parts)
 
-    def _store_for_memory_scope(self, memory_scope: str, memory_key: str | None) -> MemoryStore:
-        scope = (memory_scope or "session").strip().lower()
-        if scope == "user" and memory_key:
-            return MemoryStore.user_store(self.workspace, memory_key)
-        if scope == "session" and memory_key:
-            return MemoryStore.session_store(self.workspace, memory_key)
-        return MemoryStore.global_store(self.workspace)
+def _scan_mtimes_ns(paths: list[Path]) -> tuple[int, ...]:
+    """
+    mtime_ns for each path (-1 if missing), listing each parent directory once.
 
-    def _get_identity(
-        self,
-        *,
-        session_key: str | None = None,
-        memory_scope: str = "session",
-        memory_key: str | None = None,
-    ) -> str:
-        """Get the core identity section."""
-        from datetime import datetime
+    Files that don't exist cost nothing beyond the directory read, and on Windows the
+    directory listing already carries the stat data.
+    """
+    by_dir: dict[Path, dict[str, int]] = {}
+    for path in paths:
+        by_dir.setdefault(path.parent, {})[path.name] = -1
+    for directory, found in by_dir.items():
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.name in found:
+                        try:
+                            found[entry.name] = entry.stat().st_mtime_ns
+                        except OSError:
+                            pass
+        except OSError:
+            continue
+    return tuple(by_dir[path.parent][path.name] for path in paths)
+
+
+def _read_text_head(path: Path, max_bytes: int) -> str | None:
+    """Read and decode at most max_bytes of a UTF-8 file, or None if it can't be read."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read(max_bytes)
+    except OSError:
+        return None
+    return data.decode("utf-8", errors="replace")
 
-        now = datetime.now().strftime("%Y-%m-%d %H:%M (%A)")
-        workspace_path = str(self.workspace.expanduser().resolve())
 
-        active_store = self._store_for_memory_scope(memory_scope, memory_key or session_key)
-        active_scope_label = f"{(memory_scope or 'session').strip().lower()}:{memory_key or session_key or ''}".strip(
-            ":"
-        )
+def _b64encode_file(path: Path, chunk_size: int = 3 * 64 * 1024) -> str:
+    """Base64-encode a file in 3-byte-aligned chunks instead of one whole-file bytes object."""
+    import base64
+
+    encoded: list[bytes] = []
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            encoded.append(base64.b64encode(chunk))
+    return b"".join(encoded).decode("ascii")
+
 
-        return f"""# nanobot 🐈
+# Attachments we can send, by file suffix: the image formats vision models accept, plus PDF.
+# A fixed table avoids the platform mimetypes database (and its lazy init) per attachment.
+_MEDIA_MIMES = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".gif": "image/gif",
+    ".webp": "image/webp",
+    ".pdf": "application/pdf",
+}
+
+
+# Identity text that never changes between calls. Keeping it byte-identical (and first in
+# the system prompt) lets providers reuse their prompt cache for it.
+_IDENTITY_STATIC = """# nanobot 🐈
 
 You are nanobot — an autonomous AI agent. You are NOT an advisor. You are the executor.
 
@@ -205,16 +203,6 @@ Keep as a single spawn when subtasks are sequential or depend on each other's ou
 - **web_search / web_fetch** — Search the web and fetch page content
 - **message** — Send messages to chat channels (WhatsApp, Telegram, etc.)
 
-## Current Time
-{now}
-
-## Workspace
-Your workspace is at: {workspace_path}
-- Active memory scope: {active_scope_label or "global"}
-- Memory file: {str(active_store.memory_file)}
-- Daily notes: {str(active_store.get_today_file())}
-- Custom skills: {workspace_path}/skills/{{skill-name}}/SKILL.md
-
 ## Messaging Rules
 
 When responding to direct questions or conversations, reply directly with your text response.
@@ -223,30 +211,296 @@ For normal conversation, just respond with text — do not call the message tool
 
 ## Memory
 
-When remembering something important, write to the memory file above."""
+When remembering something important, write to the memory file listed under Workspace."""
 
-    def _get_cached(self, key: str, signature: tuple) -> str | None:
-        cached = self._cache.get(key)
-        if cached and cached[0] == signature:
-            return cached[1]
-        return None
 
-    def _set_cache(self, key: str, signature: tuple, value: str) -> None:
-        self._cache[key] = (signature, value)
+_SECTION_SEP = "\n\n---\n\n"
+
+# System prompt layouts, picked by which optional sections are non-empty so the prompt is
+# assembled with one format call instead of list appends + join.
+# Stable prefix: format(identity, bootstrap, skills), indexed by has_bootstrap | has_skills << 1.
+_STABLE_LAYOUTS = (
+    "{0}",
+    "{0}" + _SECTION_SEP + "{1}",
+    "{0}" + _SECTION_SEP + "{2}",
+    "{0}" + _SECTION_SEP + "{1}" + _SECTION_SEP + "{2}",
+)
+# Dynamic suffix: format(memory, identity tail), indexed by has_memory.
+_DYNAMIC_LAYOUTS = ("{1}", "{0}" + _SECTION_SEP + "{1}")
+
+
+class ContextBuilder:
+    """
+    Builds the context (system prompt + messages) for the agent.
+
+    Assembles bootstrap files, memory, skills, and conversation history
+    into a coherent prompt for the LLM.
+    """
+
+    BOOTSTRAP_FILES = ["AGENTS.md", "SOUL.md", "USER.md", "TOOLS.md", "IDENTITY.md"]
+
+    _SECTION_SEPARATOR = _SECTION_SEP
+    _SECTION_CACHE_MAX_ENTRIES = 16
+    _MEMORY_CACHE_MAX_ENTRIES = 16
+    _MEMORY_QUERY_MAX_CHARS = 2048
+
+    def __init__(
+        self,
+        workspace: Path,
+        memory_max_chars: int = 6000,
+        skills_max_chars: int = 12000,
+        bootstrap_max_chars: int = 4000,
+        history_max_chars: int = 80000,
+        prompt_cache_control: bool = False,
+        tool_serializer: str = "json",
+        tool_result_max_chars: int = 50000,
+    ):
+        from nanobot.agent.skills import SkillsLoader
 
-    def _truncate_tail(self, text: str, max_chars: int, label: str) -> str:
+        self.workspace = workspace
+        self._workspace_resolved = str(workspace.expanduser().resolve())
+        self.skills = SkillsLoader(workspace)
+        self.memory_max_chars = max(int(memory_max_chars), 0)
+        self.skills_max_chars = max(int(skills_max_chars), 0)
+        self.bootstrap_max_chars = max(int(bootstrap_max_chars), 0)
+        self.history_max_chars = max(int(history_max_chars), 0)
+        # Mark the stable system-prompt prefix with an Anthropic-style cache breakpoint.
+        self.prompt_cache_control = bool(prompt_cache_control)
+        # "toon": re-encode JSON tool results in the compact TOON form (see agent/toon.py).
+        self.tool_serializer = (tool_serializer or "json").strip().lower()
+        # Longer tool results keep their head and tail only (0 disables).
+        self.tool_result_max_chars = max(int(tool_result_max_chars), 0)
+        self._identity_static = _IDENTITY_STATIC
+        self._compact_tool_result: Callable[[str], str] | None = None
+        if self.tool_serializer == "toon":
+            from nanobot.agent.toon import TOON_PROMPT_NOTE, compact_tool_result
+
+            self._identity_static = f"{_IDENTITY_STATIC}\n\n## Tool Results\n\n{TOON_PROMPT_NOTE}"
+            self._compact_tool_result = compact_tool_result
+        self._cache: OrderedDict[tuple[str, Hashable], str] = OrderedDict()
+        self._memory_db: MemoryDB | None = None
+        self._memory_cache: dict[tuple, list[str]] = {}
+        # Rendered identity tails for the current minute only, keyed by memory scope. Kept out
+        # of _cache so per-session entries can't evict the stable prompt sections.
+        self._identity_minute = -1
+        self._identity_cache: dict[tuple[str, str | None, str | None], str] = {}
+        # Sections are loaded on pool threads; guards _cache and _memory_cache.
+        self._cache_lock = threading.Lock()
+        self._bootstrap_files: tuple[str, ...] = ()
+        # (section header, path) per bootstrap file; see _get_bootstrap_paths().
+        self._bootstrap_paths: list[tuple[str, Path]] = []
+
+    @property
+    def memory_db(self) -> MemoryDB:
+        if self._memory_db is None:
+            from nanobot.agent.memory_db import MemoryDB
+
+            self._memory_db = MemoryDB(self.workspace / "memory" / "memory.sqlite3")
+        return self._memory_db
+
+    def build_system_prompt(
+        self,
+        skill_names: list[str] | None = None,
+        *,
+        session_key: str | None = None,
+        memory_scope: str = "session",
+        memory_key: str | None = None,
+        current_message: str = "",
+        history: list[dict[str, Any]] | None = None,
+    ) -> str:
+        """
+        Build the system prompt from bootstrap files, memory, and skills.
+
+        Args:
+            skill_names: Optional list of skills to include.
+            session_key: Optional session key used for memory scoping.
+            current_message: Current user message (used to retrieve relevant memories).
+            history: Optional recent history (used to retrieve relevant memories).
+
+        Returns:
+            Complete system prompt.
+        """
+        return "".join(
+            self.build_system_prompt_segments(
+                skill_names,
+                session_key=session_key,
+                memory_scope=memory_scope,
+                memory_key=memory_key,
+                current_message=current_message,
+                history=history,
+            )
+        )
+
+    def build_system_prompt_segments(
+        self,
+        skill_names: list[str] | None = None,
+        *,
+        session_key: str | None = None,
+        memory_scope: str = "session",
+        memory_key: str | None = None,
+        current_message: str = "",
+        history: list[dict[str, Any]] | None = None,
+    ) -> list[str]:
+        """
+        Build the system prompt as segments whose concatenation is build_system_prompt().
+
+        Callers that can consume the pieces directly (e.g. multi-part message content) avoid
+        copying the cached stable prefix into a new string every turn.
+        """
+        stable, dynamic = self._build_system_prompt_parts(
+            skill_names,
+            session_key=session_key,
+            memory_scope=memory_scope,
+            memory_key=memory_key,
+            current_message=current_message,
+            history=history,
+        )
+        return [stable, self._SECTION_SEPARATOR, dynamic]
+
+    def _build_system_prompt_parts(
+        self,
+        skill_names: list[str] | None = None,
+        *,
+        session_key: str | None = None,
+        memory_scope: str = "session",
+        memory_key: str | None = None,
+        current_message: str = "",
+        history: list[dict[str, Any]] | None = None,
+    ) -> tuple[str, str]:
+        """
+        Build the system prompt as (stable prefix, dynamic suffix).
+
+        The prefix (identity, bootstrap, skills) only changes when workspace files change,
+        so it stays byte-identical across calls and is cacheable by the provider. Per-request
+        content (retrieved memory, time, workspace/scope info) is appended after it.
+        """
+        if memory_key is None and memory_scope == "session":
+            memory_key = session_key
+
+        # Bootstrap, skills and memory are independent and disk/SQLite bound; load them
+        # concurrently. Each section writes only its own cache keys.
+        executor = _prompt_executor()
+        bootstrap_future = executor.submit(self._get_bootstrap_content)
+        skills_future = executor.submit(self._get_skills_section, skill_names=skill_names)
+        memory_future = executor.submit(
+            self._get_memory_section,
+            session_key=session_key,
+            memory_scope=memory_scope,
+            memory_key=memory_key,
+            current_message=current_message,
+            history=history or [],
+        )
+        identity_dynamic = self._get_identity_dynamic(
+            session_key=session_key,
+            memory_scope=memory_scope,
+            memory_key=memory_key,
+        )
+
+        bootstrap = bootstrap_future.result()
+        skills_section = skills_future.result()
+        memory_section = memory_future.result()
+
+        # Sections come back as the same cached str objects while nothing on disk changes, so
+        # this signature hashes/compares in O(1) and the joined prefix is reused as-is.
+        stable_sig = (bootstrap, skills_section)
+        stable = self._get_cached("system_prompt", stable_sig)
+        if stable is None:
+            stable = _STABLE_LAYOUTS[bool(bootstrap) | bool(skills_section) << 1].format(
+                self._identity_static, bootstrap, skills_section
+            )
+            self._set_cache("system_prompt", stable_sig, stable)
+        dynamic = _DYNAMIC_LAYOUTS[bool(memory_section)].format(memory_section, identity_dynamic)
+        return stable, dynamic
+
+    def _store_for_memory_scope(self, memory_scope: str, memory_key: str | None) -> MemoryStore:
+        from nanobot.agent.memory import MemoryStore
+
+        scope = (memory_scope or "session").strip().lower()
+        if scope == "user" and memory_key:
+            return MemoryStore.user_store(self.workspace, memory_key)
+        if scope == "session" and memory_key:
+            return MemoryStore.session_store(self.workspace, memory_key)
+        return MemoryStore.global_store(self.workspace)
+
+    def _get_identity_dynamic(
+        self,
+        *,
+        session_key: str | None = None,
+        memory_scope: str = "session",
+        memory_key: str | None = None,
+    ) -> str:
+        """Get the per-request part of the identity (time, workspace, memory scope)."""
+        # Everything here is fixed for a given scope except the minute-resolution clock (and
+        # the daily-notes date, which only changes on a minute boundary too).
+        ts = time.time()
+        minute = int(ts) // 60
+        if minute != self._identity_minute:
+            # Swap in a fresh dict rather than clearing, so concurrent readers stay consistent.
+            self._identity_cache = {}
+            self._identity_minute = minute
+        identity_cache = self._identity_cache
+        scope = (memory_scope, memory_key, session_key)
+        cached = identity_cache.get(scope)
+        if cached is not None:
+            return cached
+
+        from datetime import datetime
+
+        now = datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M (%A)")
+        workspace_path = self._workspace_resolved
+
+        active_store = self._store_for_memory_scope(memory_scope, memory_key or session_key)
+        active_scope_label = f"{(memory_scope or 'session').strip().lower()}:{memory_key or session_key or ''}".strip(
+            ":"
+        )
+
+        text = f"""## Current Time
+{now}
+
+## Workspace
+Your workspace is at: {workspace_path}
+- Active memory scope: {active_scope_label or "global"}
+- Memory file: {str(active_store.memory_file)}
+- Daily notes: {str(active_store.get_today_file())}
+- Custom skills: {workspace_path}/skills/{{skill-name}}/SKILL.md"""
+        identity_cache[scope] = text
+        return text
+
+    def _get_cached(self, key: str, signature: Hashable) -> str | None:
+        entry = (key, signature)
+        with self._cache_lock:
+            cached = self._cache.get(entry)
+            if cached is not None:
+                self._cache.move_to_end(entry)
+        return cached
+
+    def _set_cache(self, key: str, signature: Hashable, value: str) -> None:
+        # Bounded LRU over (section, signature): a few variants per section (e.g. different
+        # requested skills) stay warm, and superseded signatures age out instead of piling up.
+        entry = (key, signature)
+        with self._cache_lock:
+            self._cache[entry] = value
+            self._cache.move_to_end(entry)
+            while len(self._cache) > self._SECTION_CACHE_MAX_ENTRIES:
+                self._cache.popitem(last=False)
+
+    def _truncate_tail(
+        self, text: str, max_chars: int, label: str, length: int | None = None
+    ) -> str:
         if max_chars <= 0:
             return ""
-        if len(text) <= max_chars:
+        if (len(text) if length is None else length) <= max_chars:
             return text
-        return f"[truncated {label} to last {max_chars} chars]\n" + text[-max_chars:]
+        return f"[truncated {label} to last {max_chars} chars]\n{text[-max_chars:]}"
 
-    def _truncate_head(self, text: str, max_chars: int, label: str) -> str:
+    def _truncate_head(
+        self, text: str, max_chars: int, label: str, length: int | None = None
+    ) -> str:
         if max_chars <= 0:
             return ""
-        if len(text) <= max_chars:
+        if (len(text) if length is None else length) <= max_chars:
             return text
-        return f"[truncated {label} to first {max_chars} chars]\n" + text[:max_chars]
+        return f"[truncated {label} to first {max_chars} chars]\n{text[:max_chars]}"
 
     def _trim_history(self, history: list[dict[str, Any]]) -> list[dict[str, Any]]:
         """Trim history from the front so total character count fits within budget.
@@ -257,6 +511,8 @@ When remembering something important, write to the memory file above."""
         if self.history_max_chars <= 0 or not history:
             return history
 
+        from loguru import logger
+
         def _msg_chars(m: dict[str, Any]) -> int:
             c = m.get("content")
             if isinstance(c, str):
@@ -265,21 +521,27 @@ When remembering something important, write to the memory file above."""
                 return sum(len(str(p.get("text", ""))) for p in c if isinstance(p, dict))
             return 0
 
-        total = sum(_msg_chars(m) for m in history)
-        if total <= self.history_max_chars:
+        sizes = [_msg_chars(m) for m in history]
+        if sum(sizes) <= self.history_max_chars:
             return history
 
-        # Drop oldest messages until we fit.
-        trimmed = list(history)
-        dropped = 0
-        while trimmed and total > self.history_max_chars:
-            total -= _msg_chars(trimmed[0])
-            trimmed.pop(0)
-            dropped += 1
-
+        # Keep the longest suffix that fits (equivalent to dropping oldest messages first).
+        total = 0
+        cut = len(history)
+        for i in range(len(history) - 1, -1, -1):
+            if total + sizes[i] > self.history_max_chars:
+                break
+            total += sizes[i]
+            cut = i
+        trimmed = history[cut:]
+        dropped = cut
+
+        # Arguments are only formatted if a sink accepts the level.
         logger.info(
-            f"History trimmed: dropped {dropped} message(s), "
-            f"{len(trimmed)} remaining ({total} chars)"
+            "History trimmed: dropped {} message(s), {} remaining ({} chars)",
+            dropped,
+            len(trimmed),
+            total,
         )
         note = {
             "role": "user",
@@ -291,39 +553,66 @@ When remembering something important, write to the memory file above."""
         }
         return [note] + trimmed
 
+    def _get_bootstrap_paths(self) -> list[tuple[str, Path]]:
+        """(header, path) pairs for BOOTSTRAP_FILES, rebuilt only when the list changes."""
+        files = tuple(self.BOOTSTRAP_FILES)
+        if files != self._bootstrap_files:
+            self._bootstrap_paths = [(f"## {fn}\n\n", self.workspace / fn) for fn in files]
+            self._bootstrap_files = files
+        return self._bootstrap_paths
+
     def _get_bootstrap_content(self) -> str:
         """Load bootstrap files from workspace with caching and truncation."""
-        files: list[tuple[str, float]] = []
-        for filename in self.BOOTSTRAP_FILES:
-            file_path = self.workspace / filename
-            if file_path.exists():
-                try:
-                    mtime = file_path.stat().st_mtime
-                except Exception:
-                    mtime = 0.0
-                files.append((str(file_path), mtime))
-
-        signature = (tuple(files), self.bootstrap_max_chars)
+        bootstrap_paths = self._get_bootstrap_paths()
+        # One directory scan serves both the cache check and the read pass below. The raw
+        # mtime tuple is compared directly (no hashing) since the path list is fixed.
+        mtimes = _scan_mtimes_ns([path for _, path in bootstrap_paths])
+        signature = (self._bootstrap_files, self.bootstrap_max_chars, mtimes)
         cached = self._get_cached("bootstrap", signature)
         if cached is not None:
             return cached
 
-        parts = []
-        for filename in self.BOOTSTRAP_FILES:
-            file_path = self.workspace / filename
-            if file_path.exists():
-                content = file_path.read_text(encoding="utf-8", errors="replace")
-                parts.append(f"## {filename}\n\n{content}")
+        # Only the head of the joined text survives truncation, so read each file up to the
+        # remaining budget (+1 char so truncation is still detected; 4 bytes per char is the
+        # UTF-8 worst case) and stop once the budget is exceeded.
+        max_chars = self.bootstrap_max_chars
+        buf = io.StringIO()
+        for (header, path), mtime_ns in zip(bootstrap_paths, mtimes):
+            length = buf.tell()
+            if max_chars <= 0 or length > max_chars:
+                break
+            if mtime_ns < 0:
+                continue
+            sep = "\n\n" if length else ""
+            remaining = max_chars - (length + len(sep) + len(header))
+            content = _read_text_head(path, (max(remaining, 0) + 1) * 4)
+            if content is None:
+                continue
+            buf.write(sep)
+            buf.write(header)
+            buf.write(content)
 
-        text = "\n\n".join(parts) if parts else ""
+        text = buf.getvalue()
         if text:
             # Keep the HEAD of bootstrap files so critical instructions at the top
             # don't get dropped as the file grows.
-            text = self._truncate_head(text, self.bootstrap_max_chars, "bootstrap")
+            text = self._truncate_head(
+                text, self.bootstrap_max_chars, "bootstrap", length=buf.tell()
+            )
 
         self._set_cache("bootstrap", signature, text)
         return text
 
+    def invalidate_memory_cache(self) -> None:
+        """
+        Drop cached memory retrievals (including cached empty results).
+
+        Entries are keyed on memory file mtimes, so this is only needed when memory may have
+        been rewritten within the filesystem's timestamp granularity.
+        """
+        with self._cache_lock:
+            self._memory_cache.clear()
+
     def _get_memory_section(
         self,
         *,
@@ -340,29 +629,26 @@ When remembering something important, write to the memory file above."""
         and retrieved via SQLite FTS when available.
         """
         # Build a lightweight query from the current user message and recent user turns.
-        query_parts = [current_message]
-        for m in reversed(history[-10:]):
-            if m.get("role") == "user":
-                c = m.get("content")
-                if isinstance(c, str) and c:
-                    query_parts.append(c)
-        query_text = "\n".join([p for p in query_parts if p]).strip()
+        # Search uses at most a handful of terms, so stop collecting past ~2 KB of text.
+        query_parts = [current_message] if current_message else []
+        total = len(current_message)
+        for m in islice(reversed(history), 10):
+            if total > self._MEMORY_QUERY_MAX_CHARS:
+                break
+            if m.get("role") != "user":
+                continue
+            c = m.get("content")
+            if not isinstance(c, str) or not c:
+                continue
+            query_parts.append(c)
+            total += len(c)
+        query_text = "\n".join(query_parts).strip()
         if not query_text:
             return ""
 
-        hits: list[str] = []
+        from loguru import logger
 
-        def _ingest_and_search(store: MemoryStore, scope_name: str, k: int) -> list[str]:
-            # Index long-term and today's notes for this scope.
-            self.memory_db.ingest_file_if_changed(
-                scope=scope_name, source_key=str(store.memory_file), path=store.memory_file
-            )
-            today = store.get_today_file()
-            self.memory_db.ingest_file_if_changed(
-                scope=scope_name, source_key=str(today), path=today
-            )
-            found = self.memory_db.search(scope=scope_name, query_text=query_text, limit=k)
-            return [h.content for h in found]
+        from nanobot.agent.memory import MemoryStore
 
         scope = (memory_scope or "session").strip().lower()
         scope_key = memory_key or (session_key if scope == "session" else None)
@@ -377,51 +663,75 @@ When remembering something important, write to the memory file above."""
         if active_scope_name != "global":
             scopes.append((active_store, active_scope_name))
 
-        # Keep result sizes bounded and deterministic.
-        per_scope_k = 6 if len(scopes) > 1 else 10
+        # Results only change when the query or a memory file changes, so cache them by
+        # (query digest, memory file mtimes) and skip ingest + search on a hit.
+        file_sigs: list[tuple[str, str, int]] = []
         for store, scope_name in scopes:
-            hits.extend(_ingest_and_search(store, scope_name, k=per_scope_k))
-
-        # De-dupe while preserving order.
-        seen: set[str] = set()
-        deduped: list[str] = []
-        for h in hits:
-            dedupe_key = h.strip()
-            if not dedupe_key or dedupe_key in seen:
-                continue
-            seen.add(dedupe_key)
-            deduped.append(h)
+            for path in (store.memory_file, store.get_today_file()):
+                try:
+                    mtime_ns = path.stat().st_mtime_ns
+                except OSError:
+                    mtime_ns = 0
+                file_sigs.append((scope_name, str(path), mtime_ns))
+        if not any(sig[2] for sig in file_sigs) and self.memory_db.is_empty():
+            # Fresh workspace: no memory files and nothing indexed earlier (e.g. past daily
+            # notes), so there is nothing to ingest or search.
+            return ""
+        query_digest = hashlib.blake2b(
+            query_text.encode("utf-8", errors="ignore"), digest_size=8
+        ).digest()
+        cache_key = (query_digest, tuple(file_sigs))
+
+        deduped = self._memory_cache.get(cache_key)
+        if deduped is None:
+            # Index long-term and today's notes for every scope in one transaction, then
+            # search all scopes with a single query.
+            sources: list[tuple[str, str, Path]] = []
+            for store, scope_name in scopes:
+                for path in (store.memory_file, store.get_today_file()):
+                    sources.append((scope_name, str(path), path))
+            self.memory_db.ingest_many(sources)
+
+            # Keep result sizes bounded and deterministic.
+            per_scope_k = 6 if len(scopes) > 1 else 10
+            found = self.memory_db.search_multi(
+                scopes=[scope_name for _, scope_name in scopes],
+                query_text=query_text,
+                limit_per_scope=per_scope_k,
+                max_chars=400,
+            )
+            # De-dupe on stripped content while preserving order (dicts keep insertion order).
+            deduped = list(dict.fromkeys(c for h in found if (c := h.content.strip())))
+
+            with self._cache_lock:
+                if len(self._memory_cache) >= self._MEMORY_CACHE_MAX_ENTRIES:
+                    # FIFO eviction (dicts preserve insertion order).
+                    self._memory_cache.pop(next(iter(self._memory_cache)))
+                self._memory_cache[cache_key] = deduped
 
         if not deduped:
             logger.debug("Memory retrieval: 0 hits")
             return ""
 
-        logger.debug(f"Memory retrieval: {len(deduped)} hit(s) from {len(scopes)} scope(s)")
-        lines = ["# Memory (Retrieved)", ""]
+        logger.debug("Memory retrieval: {} hit(s) from {} scope(s)", len(deduped), len(scopes))
+        buf = io.StringIO()
+        buf.write("# Memory (Retrieved)\n")
         for h in deduped:
-            cleaned = h.strip().replace("\n", " ")
-            if len(cleaned) > 400:
-                cleaned = cleaned[:400] + "..."
-            lines.append(f"- {cleaned}")
+            buf.write("\n- ")
+            buf.write(h.translate(_NL_TRANS).strip())
 
-        text = "\n".join(lines)
-        if text:
-            text = self._truncate_tail(text, self.memory_max_chars, "memory")
-        return text
+        return self._truncate_tail(
+            buf.getvalue(), self.memory_max_chars, "memory", length=buf.tell()
+        )
 
     def _get_skills_summary(self) -> str:
         """Build skills summary with caching by file mtimes."""
+        return self._get_skills_summary_signed()[1]
+
+    def _get_skills_summary_signed(self) -> tuple[bytes, str]:
+        """Return (signature, skills summary); the signature changes whenever the text may."""
         skills = self.skills.list_skills(filter_unavailable=False)
-        files: list[tuple[str, float]] = []
-        names: list[str] = []
-        for s in skills:
-            names.append(s["name"])
-            path = Path(s["path"])
-            try:
-                mtime = path.stat().st_mtime
-            except Exception:
-                mtime = 0.0
-            files.append((str(path), mtime))
+        names = [s["name"] for s in skills]
 
         # Availability depends on env vars and installed CLIs, not just file mtimes.
         availability_sig = None
@@ -431,62 +741,51 @@ When remembering something important, write to the memory file above."""
             except Exception:
                 availability_sig = None
 
-        signature = (tuple(files), availability_sig)
+        signature = _mtime_sig((s["path"] for s in skills), availability_sig)
         cached = self._get_cached("skills_summary", signature)
         if cached is not None:
-            return cached
+            return signature, cached
 
         summary = self.skills.build_skills_summary()
         self._set_cache("skills_summary", signature, summary)
-        return summary
+        return signature, summary
 
-    def _get_always_skills_content(self) -> str:
-        """Load always-on skills with caching by file mtimes."""
-        always_skills = self.skills.get_always_skills()
-        files: list[tuple[str, str, float]] = []
-        for name in always_skills:
+    def _skills_files_sig(self, names: list[str]) -> bytes:
+        """Digest of the resolved SKILL.md paths (and mtimes) for the given skill names."""
+        resolved: list[str] = []
+        paths: list[Path] = []
+        for name in names:
             path = self.skills.resolve_skill_path(name)
-            if not path:
-                continue
-            try:
-                mtime = path.stat().st_mtime
-            except Exception:
-                mtime = 0.0
-            files.append((name, str(path), mtime))
+            if path:
+                resolved.append(name)
+                paths.append(path)
+        return _mtime_sig(paths, resolved)
 
-        signature = (tuple(files),)
+    def _get_always_skills_content(self) -> tuple[bytes, str]:
+        """Load always-on skills with caching by file mtimes; returns (signature, content)."""
+        always_skills = self.skills.get_always_skills()
+        signature = self._skills_files_sig(always_skills)
         cached = self._get_cached("always_skills", signature)
         if cached is not None:
-            return cached
+            return signature, cached
 
         content = self.skills.load_skills_for_context(always_skills) if always_skills else ""
         self._set_cache("always_skills", signature, content)
-        return content
+        return signature, content
 
-    def _get_requested_skills_content(self, skill_names: list[str]) -> str:
-        """Load explicitly requested skills with caching by file mtimes."""
+    def _get_requested_skills_content(self, skill_names: list[str]) -> tuple[bytes, str]:
+        """Load requested skills with caching by file mtimes; returns (signature, content)."""
         if not skill_names:
-            return ""
-
-        files: list[tuple[str, str, float]] = []
-        for name in skill_names:
-            path = self.skills.resolve_skill_path(name)
-            if not path:
-                continue
-            try:
-                mtime = path.stat().st_mtime
-            except Exception:
-                mtime = 0.0
-            files.append((name, str(path), mtime))
+            return b"", ""
 
-        signature = (tuple(files),)
+        signature = self._skills_files_sig(skill_names)
         cached = self._get_cached("requested_skills", signature)
         if cached is not None:
-            return cached
+            return signature, cached
 
         content = self.skills.load_skills_for_context(skill_names)
         self._set_cache("requested_skills", signature, content)
-        return content
+        return signature, content
 
     def _get_skills_section(self, *, skill_names: list[str] | None = None) -> str:
         """Build full skills section with truncation and caching."""
@@ -499,42 +798,45 @@ When remembering something important, write to the memory file above."""
             requested = [s for s in requested_raw if s not in always_set]
         else:
             requested = []
-        always_content = self._get_always_skills_content()
-        skills_summary = self._get_skills_summary()
+        always_sig, always_content = self._get_always_skills_content()
+        summary_sig, skills_summary = self._get_skills_summary_signed()
 
         # Requested skills should be included verbatim in-context (progressive disclosure),
-        # so include them in the cache signature.
-        requested_content = self._get_requested_skills_content(requested)
+        # so include them in the cache signature. Sub-signatures are fixed-size digests, so
+        # concatenating them is unambiguous and avoids re-hashing the skill text itself.
+        requested_sig, requested_content = self._get_requested_skills_content(requested)
         signature = (
-            hash(always_content),
-            hash(requested_content),
-            hash(skills_summary),
-            self.skills_max_chars,
+            always_sig
+            + requested_sig.rjust(16, b"\0")
+            + summary_sig
+            + int(self.skills_max_chars).to_bytes(8, "little", signed=True)
         )
         cached = self._get_cached("skills_section", signature)
         if cached is not None:
             return cached
 
-        parts = []
+        buf = io.StringIO()
         if always_content or requested_content:
-            active_parts: list[str] = []
-            if always_content:
-                active_parts.append(always_content)
-            if requested_content:
-                active_parts.append(requested_content)
-            parts.append("# Active Skills\n\n" + "\n\n---\n\n".join(active_parts))
+            buf.write("# Active Skills\n\n")
+            buf.write(always_content)
+            if always_content and requested_content:
+                buf.write(_SECTION_SEP)
+            buf.write(requested_content)
 
         if skills_summary:
-            parts.append(f"""# Skills
+            if buf.tell():
+                buf.write(_SECTION_SEP)
+            buf.write("""# Skills
 
 The following skills extend your capabilities. To use a skill, read its SKILL.md file using the read_file tool.
 Skills with available="false" need dependencies installed first - you can try installing them with apt/brew.
 
-{skills_summary}""")
+""")
+            buf.write(skills_summary)
 
-        text = "\n\n---\n\n".join(parts) if parts else ""
+        text = buf.getvalue()
         if text:
-            text = self._truncate_tail(text, self.skills_max_chars, "skills")
+            text = self._truncate_tail(text, self.skills_max_chars, "skills", length=buf.tell())
 
         self._set_cache("skills_section", signature, text)
         return text
@@ -567,8 +869,8 @@ Skills with available="false" need dependencies installed first - you can try in
         """
         messages = []
 
-        # System prompt
-        system_prompt = self.build_system_prompt(
+        # System prompt: stable prefix first, per-request content appended after it.
+        segments = self.build_system_prompt_segments(
             skill_names,
             session_key=session_key,
             memory_scope=memory_scope,
@@ -576,7 +878,18 @@ Skills with available="false" need dependencies installed first - you can try in
             current_message=current_message,
             history=history,
         )
-        messages.append({"role": "system", "content": system_prompt})
+        system_content: str | list[dict[str, Any]]
+        if self.prompt_cache_control:
+            stable, sep, dynamic = segments
+            system_content = [
+                {"type": "text", "text": stable + sep, "cache_control": {"type": "ephemeral"}},
+                {"type": "text", "text": dynamic},
+            ]
+        else:
+            # Plain-string system content is what every OpenAI-compatible backend accepts;
+            # collapse the segments only here, at the transport boundary.
+            system_content = "".join(segments)
+        messages.append({"role": "system", "content": system_content})
 
         # History — trim oldest messages when total chars exceeds budget
         trimmed_history = self._trim_history(history)
@@ -598,28 +911,25 @@ Skills with available="false" need dependencies installed first - you can try in
         if not media:
             return text
 
-        parts: list[dict[str, Any]] = [{"type": "text", "text": text}]
-
+        attachments: list[tuple[Path, str]] = []
         for path in media:
             p = Path(path)
-            try:
-                mime, _ = mimetypes.guess_type(str(p))
-            except Exception:
-                mime = None
-
-            if not p.is_file() or not mime:
-                continue
-
-            if mime.startswith("image/"):
-                b64 = base64.b64encode(p.read_bytes()).decode()
-                parts.append(
-                    {"type": "image_url", "image_url": {"url": f"data:{mime};base64,{b64}"}}
-                )
-                continue
+            mime = _MEDIA_MIMES.get(p.suffix.lower())
+            if mime and p.is_file():
+                attachments.append((p, mime))
+
+        # Encode attachments in parallel (file reads release the GIL); results keep the
+        # original order.
+        if len(attachments) > 1:
+            data_urls = list(
+                _prompt_executor().map(lambda a: self._media_data_url(*a), attachments)
+            )
+        else:
+            data_urls = [self._media_data_url(p, mime) for p, mime in attachments]
 
+        parts: list[dict[str, Any]] = [{"type": "text", "text": text}]
+        for (p, mime), data_url in zip(attachments, data_urls):
             if mime == "application/pdf":
-                b64 = base64.b64encode(p.read_bytes()).decode()
-                data_url = f"data:application/pdf;base64,{b64}"
                 # OpenRouter guide uses a file part for PDFs. Keep filename for UX.
                 parts.append(
                     {
@@ -630,18 +940,29 @@ Skills with available="false" need dependencies installed first - you can try in
                         },
                     }
                 )
-                continue
+            else:
+                parts.append({"type": "image_url", "image_url": {"url": data_url}})
 
         # If we didn't attach anything, fall back to plain text for maximum compatibility.
         if len(parts) == 1:
             return text
         return parts
 
+    @staticmethod
+    def _media_data_url(p: Path, mime: str) -> str:
+        """
+        Return a base64 data URL for a media file.
+
+        Not cached: only the current turn's attachments are encoded, and uploads get unique
+        paths, so a cache would rarely hit while pinning up to ~20 MB of base64 per file.
+        """
+        return f"data:{mime};base64,{_b64encode_file(p)}"
+
     def add_tool_result(
         self, messages: list[dict[str, Any]], tool_call_id: str, tool_name: str, result: str
     ) -> list[dict[str, Any]]:
         """
-        Add a tool result to the message list.
+        Append a tool result to the message list in place.
 
         Args:
             messages: Current message list.
@@ -650,13 +971,56 @@ Skills with available="false" need dependencies installed first - you can try in
             result: Tool execution result.
 
         Returns:
-            Updated message list.
+            The same list, for chaining.
         """
         messages.append(
-            {"role": "tool", "tool_call_id": tool_call_id, "name": tool_name, "content": result}
+            {
+                "role": "tool",
+                "tool_call_id": tool_call_id,
+                "name": tool_name,
+                "content": self._tool_result_content(result),
+            }
         )
         return messages
 
+    def add_tool_results(
+        self, messages: list[dict[str, Any]], results: Iterable[tuple[str, str, str]]
+    ) -> list[dict[str, Any]]:
+        """
+        Append a batch of tool results to the message list in place.
+
+        Args:
+            messages: Current message list.
+            results: (tool_call_id, tool_name, result) triples, in call order.
+
+        Returns:
+            The same list, for chaining.
+        """
+        content = self._tool_result_content
+        messages.extend(
+            {
+                "role": "tool",
+                "tool_call_id": tool_call_id,
+                "name": tool_name,
+                "content": content(result),
+            }
+            for tool_call_id, tool_name, result in results
+        )
+        return messages
+
+    def _tool_result_content(self, result: str) -> str:
+        """Tool result as sent to the model: TOON-compacted if enabled, then size-capped."""
+        if self._compact_tool_result is not None:
+            result = self._compact_tool_result(result)
+        limit = self.tool_result_max_chars
+        if limit and len(result) > limit:
+            # Keep both ends: file headers/imports and command exit output are the usual signal.
+            head = limit // 2
+            tail = limit - head
+            marker = f"\n[... {len(result) - limit} chars omitted ...]\n"
+            result = result[:head] + marker + result[-tail:]
+        return result
+
     def add_assistant_message(
         self,
         messages: list[dict[str, Any]],
@@ -664,7 +1028,7 @@ Skills with available="false" need dependencies installed first - you can try in
         tool_calls: list[dict[str, Any]] | None = None,
     ) -> list[dict[str, Any]]:
         """
-        Add an assistant message to the message list.
+        Append an assistant message to the message list in place.
 
         Args:
             messages: Current message list.
@@ -672,7 +1036,7 @@ Skills with available="false" need dependencies installed first - you can try in
             tool_calls: Optional tool calls.
 
         Returns:
-            Updated message list.
+            The same list, for chaining.
         """
         msg: dict[str, Any] = {"role": "assistant", "content": content or ""}
 
@@ -0,0 +1,148 @@
+"""In-process response cache for deterministic (temperature 0) LLM calls."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import replace
+from typing import Any
+
+from loguru import logger
+
+from nanobot.providers.base import LLMResponse
+
+
+class _SharedCallCancelledError(Exception):
+    """Set on a shared in-flight call whose owning caller was cancelled."""
+
+
+class LLMCache:
+    """
+    Bounded LRU of provider responses keyed on the full request.
+
+    Only greedy (temperature 0) requests are cached; sampled ones are always sent to the
+    provider. Failed calls raise and are never stored. Entries expire after `ttl_s` seconds
+    (0 keeps them until evicted). Identical requests arriving while one is in flight (e.g.
+    several chats hitting the same prompt at once) wait for it instead of calling again.
+    Hits come back with empty `usage`, since no tokens were spent on them.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl_s: float = 3600.0):
+        self.max_entries = max(int(max_entries), 0)
+        self.ttl_s = max(float(ttl_s), 0.0)
+        # digest -> (monotonic expiry or None, response)
+        self._entries: OrderedDict[str, tuple[float | None, LLMResponse]] = OrderedDict()
+        self._in_flight: dict[str, asyncio.Future[LLMResponse]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def key(
+        self,
+        *,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+        model: str | None,
+        max_tokens: int,
+        temperature: float,
+    ) -> str | None:
+        """Digest of the request, or None if it must not be cached."""
+        if self.max_entries <= 0 or temperature > 0:
+            return None
+        payload = json.dumps(
+            {
+                "model": model,
+                "messages": messages,
+                "tools": tools,
+                "max_tokens": max_tokens,
+                "temperature": temperature,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def get_or_call(
+        self,
+        call: Callable[..., Awaitable[LLMResponse]],
+        *,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+        model: str | None,
+        max_tokens: int,
+        temperature: float,
+        **kwargs: Any,
+    ) -> LLMResponse:
+        """
+        Return the cached response for this request, or await `call` and store it.
+
+        Only the caller that made the request gets its `usage`; hits (including waiters on
+        an in-flight call) get a copy with `usage={}` so the spend isn't counted twice.
+        """
+        key = self.key(
+            messages=messages,
+            tools=tools,
+            model=model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+        )
+        fut: asyncio.Future[LLMResponse] | None = None
+        while key is not None:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, cached = entry
+                if expires is None or time.monotonic() < expires:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    logger.debug("LLM cache hit ({} hits / {} misses)", self.hits, self.misses)
+                    return replace(cached, usage={})
+                del self._entries[key]
+            in_flight = self._in_flight.get(key)
+            if in_flight is None:
+                self.misses += 1
+                fut = asyncio.get_running_loop().create_future()
+                self._in_flight[key] = fut
+                break
+            try:
+                # Shielded so a cancelled waiter doesn't cancel the shared call.
+                response = await asyncio.shield(in_flight)
+            except _SharedCallCancelledError:
+                # Its owner was cancelled (e.g. /stop in another chat); look again and make
+                # the call ourselves unless someone else already has.
+                continue
+            self.hits += 1
+            return replace(response, usage={})
+
+        try:
+            response = await call(
+                messages=messages,
+                tools=tools,
+                model=model,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                **kwargs,
+            )
+        except BaseException as e:
+            if fut is not None:
+                # Never cancel the shared future: that would cancel unrelated waiting turns.
+                fut.set_exception(e if isinstance(e, Exception) else _SharedCallCancelledError())
+                fut.exception()  # Waiters handle it; don't warn if there are none.
+            raise
+        finally:
+            if key is not None:
+                self._in_flight.pop(key, None)
+
+        if fut is not None:
+            expires = time.monotonic() + self.ttl_s if self.ttl_s else None
+            self._entries[key] = (expires, response)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            fut.set_result(response)
+        return response
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        self._entries.clear()
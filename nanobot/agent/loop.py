@@ -3,14 +3,20 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import hashlib
 import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from functools import lru_cache, partial
 from pathlib import Path
+from types import MappingProxyType
 from typing import TYPE_CHECKING, Any
+from urllib.parse import urlparse
 
 from loguru import logger
 
 from nanobot.agent.context import ContextBuilder
+from nanobot.agent.llm_cache import LLMCache
 from nanobot.agent.subagent import SubagentManager
 from nanobot.agent.tools.filesystem import EditFileTool, ListDirTool, ReadFileTool, WriteFileTool
 from nanobot.agent.tools.message import MessageTool
@@ -19,17 +25,58 @@ from nanobot.agent.tools.shell import ExecTool
 from nanobot.agent.tools.spawn import SpawnTool
 from nanobot.agent.tools.subagent_control import SubagentControlTool
 from nanobot.agent.tools.web import FirecrawlScrapeTool, WebFetchTool, WebSearchTool
-from nanobot.agent.utils import is_tool_error
+from nanobot.agent.utils import dumps_compact, is_tool_error
 from nanobot.bus.events import InboundMessage, OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.providers.base import LLMError, LLMProvider
 from nanobot.session.manager import SessionManager
 
 if TYPE_CHECKING:
+    from nanobot.agent.tools.base import Tool
     from nanobot.config.schema import AgentDefaults, ExecToolConfig
     from nanobot.session.manager import Session
 
 
+@lru_cache(maxsize=256)
+def _url_host(url: str) -> str:
+    """Host part of a URL for status messages (agents often re-fetch the same pages)."""
+    try:
+        return urlparse(url).netloc
+    except Exception:
+        return ""
+
+
+@lru_cache(maxsize=1024)
+def _parse_system_chat_id(chat_id: str) -> tuple[str, str, str]:
+    """
+    Split a system message's "channel:chat_id" origin into (channel, chat_id, session_key).
+
+    Subagents announce to the same few origins repeatedly, so results are memoized.
+    """
+    channel, sep, origin_chat_id = chat_id.partition(":")
+    if not sep:
+        channel, origin_chat_id = "cli", chat_id
+    return channel, origin_chat_id, f"{channel}:{origin_chat_id}"
+
+
+# Tools that can rewrite memory files in the workspace.
+_MEMORY_WRITE_TOOLS = frozenset({"write_file", "edit_file", "exec"})
+
+# Shared stand-in for missing/non-dict message metadata (read-only, never allocated per message).
+_EMPTY_META: Mapping[str, Any] = MappingProxyType({})
+
+
+def _model_name(value: Any) -> str | None:
+    """A stripped model override, or None if the value isn't a usable name."""
+    if isinstance(value, str):
+        return value.strip() or None
+    return None
+
+
+# Minimum gap between tool status lines per session verbosity (nanoseconds).
+_VERBOSITY_INTERVALS_NS = {"low": 5_000_000_000, "normal": 2_000_000_000, "high": 800_000_000}
+
+
 class AgentLoop:
     """
     The agent loop is the core processing engine.
@@ -42,6 +89,9 @@ class AgentLoop:
     5. Sends responses back
     """
 
+    # Per-chat request tool registries kept for reuse across turns.
+    _REQUEST_TOOLS_CACHE_MAX = 256
+
     def __init__(
         self,
         bus: MessageBus,
@@ -74,6 +124,9 @@ class AgentLoop:
 
         self.max_tokens = cfg.max_tokens
         self.temperature = cfg.temperature
+        # Identical greedy (temperature 0) requests are answered from memory.
+        self._llm_cache = LLMCache(max_entries=cfg.llm_cache_entries, ttl_s=cfg.llm_cache_ttl_s)
+        self.stream_responses = bool(cfg.stream_responses)
         self.memory_scope = (getattr(cfg, "memory_scope", None) or "session").strip().lower()
         self.max_concurrent_messages = max(
             int(getattr(cfg, "max_concurrent_messages", 1) or 1),
@@ -110,6 +163,9 @@ class AgentLoop:
             skills_max_chars=cfg.skills_max_chars,
             bootstrap_max_chars=cfg.bootstrap_max_chars,
             history_max_chars=cfg.history_max_chars,
+            prompt_cache_control=cfg.prompt_cache_control,
+            tool_serializer=cfg.tool_serializer,
+            tool_result_max_chars=cfg.tool_result_max_chars,
         )
         self.sessions = SessionManager(workspace)
 
@@ -135,6 +191,9 @@ class AgentLoop:
         )
 
         self._running = False
+        self._consume_task: asyncio.Future[list[InboundMessage]] | None = None
+        self._scoped_tool_sets: dict[bool, list[Tool]] = {}
+        self._request_tools: OrderedDict[tuple, ToolRegistry] = OrderedDict()
         self._register_default_tools()
 
     def _session_key_for_inbound(self, msg: InboundMessage) -> str:
@@ -143,23 +202,25 @@ class AgentLoop:
             return msg.session_key
 
         # System messages route back to the origin session; keep ordering consistent.
-        if ":" in msg.chat_id:
-            origin_channel, origin_chat_id = msg.chat_id.split(":", 1)
-        else:
-            origin_channel, origin_chat_id = "cli", msg.chat_id
-        return f"{origin_channel}:{origin_chat_id}"
+        return _parse_system_chat_id(msg.chat_id)[2]
 
     def _build_tools_for_request(
         self,
         *,
         channel: str,
         chat_id: str,
-        allowed_tools: list[str] | None,
-        restrict_workspace: bool | None,
+        allowed_tools: Any,
+        restrict_workspace: Any,
         model: str | None = None,
     ) -> ToolRegistry:
-        """Build a request-scoped tool registry (no shared mutable per-chat state)."""
-        reg = ToolRegistry()
+        """
+        Return the request-scoped tool registry for a chat (no shared mutable per-chat state).
+
+        Registries only depend on the chat, its tool allowlist and workspace restriction, so
+        they are cached per chat (bounded LRU) and reused across turns, together with their
+        memoized tool definitions and result cache. Values straight from session metadata
+        are accepted: anything but a list (allowlist) or bool (restriction) counts as unset.
+        """
         effective_restrict = restrict_workspace if isinstance(restrict_workspace, bool) else None
         if (
             effective_restrict is False
@@ -167,43 +228,30 @@ class AgentLoop:
             and not getattr(self.exec_config, "allow_unrestricted_workspace", False)
         ):
             effective_restrict = True
+        allowed = (
+            [t for t in allowed_tools if isinstance(t, str)]
+            if isinstance(allowed_tools, list)
+            else None
+        )
 
-        if isinstance(effective_restrict, bool):
-            reg.register(
-                ReadFileTool(
-                    workspace_root=self.workspace,
-                    restrict_to_workspace=effective_restrict,
-                )
-            )
-            reg.register(
-                WriteFileTool(
-                    workspace_root=self.workspace,
-                    restrict_to_workspace=effective_restrict,
-                )
-            )
-            reg.register(
-                EditFileTool(
-                    workspace_root=self.workspace,
-                    restrict_to_workspace=effective_restrict,
-                )
-            )
-            reg.register(
-                ListDirTool(
-                    workspace_root=self.workspace,
-                    restrict_to_workspace=effective_restrict,
-                )
-            )
-            reg.register(
-                ExecTool(
-                    working_dir=str(self.workspace),
-                    timeout=self.exec_config.timeout,
-                    restrict_to_workspace=effective_restrict,
-                )
-            )
-            reg.register(SubagentControlTool(manager=self.subagents))
-            reg.register(WebSearchTool(api_key=self.brave_api_key))
-            reg.register(WebFetchTool())
-            reg.register(FirecrawlScrapeTool(api_key=self.firecrawl_api_key))
+        key = (
+            channel,
+            chat_id,
+            tuple(sorted(allowed)) if allowed is not None else None,
+            effective_restrict,
+            # Unscoped registries copy self.tools, so they go stale when it changes.
+            self.tools.generation if effective_restrict is None else None,
+        )
+        cache = self._request_tools
+        reg = cache.get(key)
+        if reg is not None:
+            cache.move_to_end(key)
+            return reg
+
+        reg = ToolRegistry()
+        if effective_restrict is not None:
+            for tool in self._scoped_tools(effective_restrict):
+                reg.register(tool)
         else:
             # Copy all registered tools, but always override message/spawn with request-scoped instances.
             for tool in self.tools.iter_tools():
@@ -222,56 +270,69 @@ class AgentLoop:
         spawn_tool.set_context(channel, chat_id)
         reg.register(spawn_tool)
 
-        reg.set_allowed_tools(allowed_tools if isinstance(allowed_tools, list) else None)
+        reg.set_allowed_tools(allowed)
+        cache[key] = reg
+        if len(cache) > self._REQUEST_TOOLS_CACHE_MAX:
+            cache.popitem(last=False)
         return reg
 
-    def _register_default_tools(self) -> None:
-        """Register the default set of tools."""
-        # File tools
-        self.tools.register(
-            ReadFileTool(
-                workspace_root=self.workspace,
-                restrict_to_workspace=self.exec_config.restrict_to_workspace,
-            )
-        )
-        self.tools.register(
-            WriteFileTool(
-                workspace_root=self.workspace,
-                restrict_to_workspace=self.exec_config.restrict_to_workspace,
-            )
-        )
-        self.tools.register(
-            EditFileTool(
-                workspace_root=self.workspace,
-                restrict_to_workspace=self.exec_config.restrict_to_workspace,
-            )
-        )
-        self.tools.register(
-            ListDirTool(
-                workspace_root=self.workspace,
-                restrict_to_workspace=self.exec_config.restrict_to_workspace,
-            )
-        )
+    def _scoped_tools(self, restrict: bool) -> list[Tool]:
+        """
+        Workspace/web tools for a given restrict_to_workspace flag.
 
-        # Shell tool
-        self.tools.register(
-            ExecTool(
-                working_dir=str(self.workspace),
-                timeout=self.exec_config.timeout,
-                restrict_to_workspace=self.exec_config.restrict_to_workspace,
-            )
-        )
+        These tools hold only construction-time config, so one set per flag is built lazily
+        and shared by every request; message/spawn stay request-scoped.
+        """
+        tools = self._scoped_tool_sets.get(restrict)
+        if tools is None:
+            tools = [
+                ReadFileTool(workspace_root=self.workspace, restrict_to_workspace=restrict),
+                WriteFileTool(workspace_root=self.workspace, restrict_to_workspace=restrict),
+                EditFileTool(workspace_root=self.workspace, restrict_to_workspace=restrict),
+                ListDirTool(workspace_root=self.workspace, restrict_to_workspace=restrict),
+                ExecTool(
+                    working_dir=str(self.workspace),
+                    timeout=self.exec_config.timeout,
+                    restrict_to_workspace=restrict,
+                ),
+                WebSearchTool(api_key=self.brave_api_key),
+                WebFetchTool(),
+                FirecrawlScrapeTool(api_key=self.firecrawl_api_key),
+                SubagentControlTool(manager=self.subagents),
+            ]
+            self._scoped_tool_sets[restrict] = tools
+        return tools
 
-        # Web tools
-        self.tools.register(WebSearchTool(api_key=self.brave_api_key))
-        self.tools.register(WebFetchTool())
-        self.tools.register(FirecrawlScrapeTool(api_key=self.firecrawl_api_key))
-        self.tools.register(SubagentControlTool(manager=self.subagents))
+    def _register_default_tools(self) -> None:
+        """Register the default set of tools."""
+        # Same instances as the scoped set for the configured flag, so sessions without an
+        # override and sessions overriding to the same value share one set of tools.
+        for tool in self._scoped_tools(self.exec_config.restrict_to_workspace):
+            self.tools.register(tool)
 
         # Note: message/spawn tools are NOT registered on the base registry.
         # They are always created per-request in _build_tools_for_request() to avoid
         # cross-chat state leaks (default channel/chat_id context).
 
+    def _prompt_cache_key(
+        self, messages: list[dict[str, Any]], tool_defs: list[dict[str, Any]]
+    ) -> str | None:
+        """
+        Stable key for the cacheable prefix (system prompt head + tool schemas).
+
+        Only set when prompt caching is enabled; the system message then carries the stable
+        prefix as its first (cache_control-marked) part, and only that part is hashed so
+        per-request memory/time and the growing tool-result tail don't change the key.
+        """
+        if not self.context.prompt_cache_control or not messages:
+            return None
+        content = messages[0].get("content")
+        if not isinstance(content, list) or not content:
+            return None
+        h = hashlib.blake2b(str(content[0].get("text", "")).encode("utf-8"), digest_size=16)
+        h.update(dumps_compact(tool_defs).encode("utf-8"))
+        return h.hexdigest()
+
     def _is_tool_error(self, result: str) -> bool:
         return is_tool_error(result)
 
@@ -294,13 +355,13 @@ class AgentLoop:
             "max_tokens": max_tokens_used,
             "cost": usage.get("cost"),
         }
-        history = session.metadata.get("usage_history") or []
+        history = session.metadata.get("usage_history")
         if not isinstance(history, list):
-            history = []
+            history = session.metadata["usage_history"] = []
         history.append(record)
+        # Trim in place: metadata must stay a plain JSON list for session saves.
         if len(history) > 20:
-            history = history[-20:]
-        session.metadata["usage_history"] = history
+            del history[:-20]
 
         cost = usage.get("cost")
         if cost is not None:
@@ -336,11 +397,12 @@ class AgentLoop:
 
         session.metadata["token_tune_streak"] = streak
 
-    async def _emit_status(self, channel: str, chat_id: str, content: str) -> None:
+    def _emit_status(self, channel: str, chat_id: str, content: str) -> None:
+        # Status lines are fire-and-forget: enqueue without suspending the tool loop.
         if not content:
             return
         try:
-            await self.bus.publish_outbound(
+            self.bus.publish_outbound_nowait(
                 OutboundMessage(
                     channel=channel,
                     chat_id=chat_id,
@@ -351,16 +413,27 @@ class AgentLoop:
         except Exception:
             pass
 
+    def _emit_delta(self, channel: str, chat_id: str, content: str, *, reset: bool = False) -> None:
+        # Partial reply text; channels that can't update a message in place drop these.
+        # reset marks the start of a new LLM call, so clients discard earlier partial text.
+        metadata: dict[str, Any] = {"type": "delta"}
+        if reset:
+            metadata["data"] = {"reset": True}
+        try:
+            self.bus.publish_outbound_nowait(
+                OutboundMessage(
+                    channel=channel,
+                    chat_id=chat_id,
+                    content=content,
+                    metadata=metadata,
+                )
+            )
+        except Exception:
+            pass
+
     def _format_tool_status(self, tool_name: str, args: dict[str, Any]) -> str:
         if tool_name == "web_fetch":
-            url = str(args.get("url") or "").strip()
-            host = ""
-            try:
-                from urllib.parse import urlparse
-
-                host = urlparse(url).netloc
-            except Exception:
-                host = ""
+            host = _url_host(str(args.get("url") or "").strip())
             return f"Fetching {host or 'a web page'}..."
         if tool_name == "web_search":
             q = str(args.get("query") or "").strip()
@@ -385,20 +458,20 @@ class AgentLoop:
             return "Starting a background task..."
         return "Working on it..."
 
-    async def _maybe_emit_tool_status(
+    def _maybe_emit_tool_status(
         self,
         channel: str,
         chat_id: str,
         tool_name: str,
         args: dict[str, Any],
-        last_status_ts: float,
-        min_interval_s: float = 2.0,
-    ) -> float:
-        now = time.monotonic()
-        if now - last_status_ts < min_interval_s:
-            return last_status_ts
+        last_status_ns: int,
+        min_interval_ns: int = 2_000_000_000,
+    ) -> int:
+        now = time.monotonic_ns()
+        if now - last_status_ns < min_interval_ns:
+            return last_status_ns
         msg = self._format_tool_status(tool_name, args)
-        await self._emit_status(channel, chat_id, msg)
+        self._emit_status(channel, chat_id, msg)
         return now
 
     async def run(self) -> None:
@@ -417,14 +490,10 @@ class AgentLoop:
             if msg.channel == "system":
                 logger.warning(f"Dropping system message due to backlog: {reason}")
                 return
-            err_channel = msg.channel
-            err_chat_id = msg.chat_id
-            if msg.channel == "system" and ":" in msg.chat_id:
-                err_channel, err_chat_id = msg.chat_id.split(":", 1)
             await self.bus.publish_outbound(
                 OutboundMessage(
-                    channel=err_channel,
-                    chat_id=err_chat_id,
+                    channel=msg.channel,
+                    chat_id=msg.chat_id,
                     content="I'm currently busy and couldn't queue your request. Please try again shortly.",
                 )
             )
@@ -436,10 +505,11 @@ class AgentLoop:
                     await self.bus.publish_outbound(response)
             except Exception as e:
                 logger.opt(exception=True).error(f"Error processing message: {e}")
-                err_channel = msg.channel
-                err_chat_id = msg.chat_id
-                if msg.channel == "system" and ":" in msg.chat_id:
-                    err_channel, err_chat_id = msg.chat_id.split(":", 1)
+                err_channel, err_chat_id = msg.channel, msg.chat_id
+                if msg.channel == "system":
+                    head, sep, tail = msg.chat_id.partition(":")
+                    if sep:
+                        err_channel, err_chat_id = head, tail
                 await self.bus.publish_outbound(
                     OutboundMessage(
                         channel=err_channel,
@@ -524,22 +594,33 @@ class AgentLoop:
 
         try:
             while self._running:
+                # Block until a message arrives; stop() cancels this wait directly instead of
+                # the loop polling _running on a timeout.
+                self._consume_task = asyncio.ensure_future(self.bus.consume_inbound_batch())
                 try:
-                    msg = await asyncio.wait_for(self.bus.consume_inbound(), timeout=1.0)
-                except asyncio.TimeoutError:
-                    continue
+                    batch = await self._consume_task
+                except asyncio.CancelledError:
+                    if self._running:
+                        raise  # run() itself was cancelled
+                    break
+                finally:
+                    self._consume_task = None
 
-                session_key = self._session_key_for_inbound(msg)
-                await _enqueue(msg, session_key)
+                # Bursts are dispatched from a single wakeup.
+                for msg in batch:
+                    await _enqueue(msg, self._session_key_for_inbound(msg))
         finally:
             if session_workers:
                 for task in session_workers.values():
                     task.cancel()
                 await asyncio.gather(*session_workers.values(), return_exceptions=True)
+            await self.sessions.flush()
 
     def stop(self) -> None:
         """Stop the agent loop."""
         self._running = False
+        if self._consume_task is not None:
+            self._consume_task.cancel()
         logger.info("Agent loop stopping")
 
     async def _run_tool_loop(
@@ -559,34 +640,60 @@ class AgentLoop:
         final_content: str | None = None
         tool_error_streak = 0
         last_tool_error: tuple[str, str] | None = None
-        last_status_ts = 0.0
+        last_status_ns = 0
         nudged_for_response = False
         loop_start = time.monotonic()
 
+        # Verbosity is fixed for the whole loop; resolve the status rate limit once.
+        min_interval_ns = _VERBOSITY_INTERVALS_NS.get(
+            (verbosity or "normal").strip().lower(), _VERBOSITY_INTERVALS_NS["normal"]
+        )
+
         chosen_model = (model or "").strip() or self.model
+        # The request-scoped registry doesn't change mid-loop; build the schema list once.
+        tool_defs = tools.get_definitions()
+        chat_kwargs: dict[str, Any] = {}
+        if cache_key := self._prompt_cache_key(messages, tool_defs):
+            chat_kwargs["prompt_cache_key"] = cache_key
+        # Only auto-tuning (after a final answer) changes the session's limit; refreshed there.
+        max_tokens_used = self._get_session_max_tokens(session)
+
+        chat = self.provider.chat
+        # CLI turns have no outbound consumer to render partial text.
+        streaming = self.stream_responses and channel and chat_id and channel != "cli"
+        if streaming:
+            chat = partial(
+                self.provider.chat_stream, on_delta=partial(self._emit_delta, channel, chat_id)
+            )
 
         while iteration < self.max_iterations:
             iteration += 1
 
-            max_tokens_used = self._get_session_max_tokens(session)
-
+            if streaming:
+                self._emit_delta(channel, chat_id, "", reset=True)
             llm_start = time.monotonic()
-            response = await self.provider.chat(
+            response = await self._llm_cache.get_or_call(
+                chat,
                 messages=messages,
-                tools=tools.get_definitions(),
+                tools=tool_defs,
                 model=chosen_model,
                 max_tokens=max_tokens_used,
                 temperature=self.temperature,
+                **chat_kwargs,
             )
             llm_ms = int((time.monotonic() - llm_start) * 1000)
 
             prompt_tokens = (response.usage or {}).get("prompt_tokens", 0)
             completion_tokens = (response.usage or {}).get("completion_tokens", 0)
             cost = (response.usage or {}).get("cost")
+            # Arguments are only formatted if a sink accepts the level.
             logger.debug(
-                f"LLM call #{iteration}: {llm_ms}ms, "
-                f"prompt={prompt_tokens} completion={completion_tokens}"
-                + (f" cost=${cost:.4f}" if cost else "")
+                "LLM call #{}: {}ms, prompt={} completion={}{}",
+                iteration,
+                llm_ms,
+                prompt_tokens,
+                completion_tokens,
+                f" cost=${cost:.4f}" if cost else "",
             )
 
             self._record_usage(session, response.usage, max_tokens_used)
@@ -598,49 +705,42 @@ class AgentLoop:
                         "type": "function",
                         "function": {
                             "name": tc.name,
-                            "arguments": json.dumps(tc.arguments),
+                            "arguments": tc.raw_arguments or dumps_compact(tc.arguments),
                         },
                     }
                     for tc in response.tool_calls
                 ]
-                messages = self.context.add_assistant_message(
-                    messages, response.content, tool_call_dicts
-                )
+                self.context.add_assistant_message(messages, response.content, tool_call_dicts)
 
                 abort_loop = False
                 for tool_call in response.tool_calls:
                     logger.debug(
-                        f"Executing tool: {tool_call.name} with arguments: {tool_call.arguments}"
+                        "Executing tool: {} with arguments: {}", tool_call.name, tool_call.arguments
                     )
                     if channel and chat_id:
-                        v = (verbosity or "normal").strip().lower()
-                        min_interval = 2.0
-                        if v == "low":
-                            min_interval = 5.0
-                        elif v == "high":
-                            min_interval = 0.8
-                        last_status_ts = await self._maybe_emit_tool_status(
+                        last_status_ns = self._maybe_emit_tool_status(
                             channel,
                             chat_id,
                             tool_call.name,
                             tool_call.arguments,
-                            last_status_ts,
-                            min_interval_s=min_interval,
+                            last_status_ns,
+                            min_interval_ns=min_interval_ns,
                         )
                 tools_start = time.monotonic()
                 results = await tools.execute_calls(response.tool_calls, allow_parallel=True)
                 tools_ms = int((time.monotonic() - tools_start) * 1000)
                 tool_names = [tc.name for tc in response.tool_calls]
-                logger.debug(f"Tools executed: {tool_names} in {tools_ms}ms")
-                for tool_call, result in zip(response.tool_calls, results):
-                    messages = self.context.add_tool_result(
-                        messages,
-                        tool_call.id,
-                        tool_call.name,
-                        result,
-                    )
+                logger.debug("Tools executed: {} in {}ms", tool_names, tools_ms)
+                if not _MEMORY_WRITE_TOOLS.isdisjoint(tool_names):
+                    # The agent may have just updated a memory file; don't serve stale hits.
+                    self.context.invalidate_memory_cache()
+                self.context.add_tool_results(
+                    messages,
+                    ((tc.id, tc.name, r) for tc, r in zip(response.tool_calls, results)),
+                )
 
-                    if self.tool_error_backoff > 0:
+                if self.tool_error_backoff > 0:
+                    for tool_call, result in zip(response.tool_calls, results):
                         if self._is_tool_error(result):
                             tool_error_streak += 1
                             last_tool_error = (tool_call.name, result)
@@ -690,6 +790,7 @@ class AgentLoop:
                 and iteration < self.max_iterations
             ):
                 nudged_for_response = True
+                max_tokens_used = self._get_session_max_tokens(session)
                 messages.append(
                     {
                         "role": "user",
@@ -726,12 +827,8 @@ class AgentLoop:
 
         logger.info(f"Processing message from {msg.channel}:{msg.sender_id}")
 
-        meta_override = None
-        try:
-            if isinstance(msg.metadata, dict):
-                meta_override = msg.metadata.get("session_key")
-        except Exception:
-            meta_override = None
+        meta = msg.metadata if isinstance(msg.metadata, dict) else _EMPTY_META
+        meta_override = meta.get("session_key")
 
         channel_key = (msg.channel or "").strip().lower()
         if channel_key not in self.trusted_session_override_channels:
@@ -742,36 +839,25 @@ class AgentLoop:
             or (meta_override if isinstance(meta_override, str) and meta_override else None)
             or msg.session_key
         )
-        session = self.sessions.get_or_create(session_key)
+        session = await self.sessions.get_or_create_async(session_key)
         allowed_tools = session.metadata.get("allowed_tools", self.allowed_tools)
         restrict_workspace = session.metadata.get("restrict_workspace")
 
         # Per-session model override (set by WebUI model switcher, etc.).
-        chosen_model: str | None = None
-        try:
-            m = session.metadata.get("model")
-            if isinstance(m, str) and m.strip():
-                chosen_model = m.strip()
-        except Exception:
-            chosen_model = None
-        if not chosen_model:
-            try:
-                if isinstance(msg.metadata, dict):
-                    m2 = msg.metadata.get("model")
-                    if isinstance(m2, str) and m2.strip():
-                        chosen_model = m2.strip()
-            except Exception:
-                chosen_model = None
+        chosen_model = _model_name(session.metadata.get("model")) or _model_name(meta.get("model"))
 
         tools = self._build_tools_for_request(
             channel=msg.channel,
             chat_id=msg.chat_id,
-            allowed_tools=allowed_tools if isinstance(allowed_tools, list) else None,
-            restrict_workspace=restrict_workspace if isinstance(restrict_workspace, bool) else None,
+            allowed_tools=allowed_tools,
+            restrict_workspace=restrict_workspace,
             model=chosen_model,
         )
 
-        messages = self.context.build_messages(
+        # Prompt assembly reads bootstrap/memory/media files and queries SQLite; keep that
+        # off the event loop so other sessions aren't stalled behind it.
+        messages = await asyncio.to_thread(
+            self.context.build_messages,
             history=session.get_history(),
             current_message=msg.content,
             session_key=session_key,
@@ -810,7 +896,7 @@ class AgentLoop:
         else:
             session.add_message("user", msg.content)
         session.add_message("assistant", final_content)
-        await self.sessions.save_async(session)
+        self.sessions.save_background(session)
 
         return OutboundMessage(
             channel=msg.channel,
@@ -884,21 +970,10 @@ class AgentLoop:
         logger.info(f"Processing system message from {msg.sender_id}")
 
         # Parse origin from chat_id (format: "channel:chat_id").
-        if ":" in msg.chat_id:
-            origin_channel, origin_chat_id = msg.chat_id.split(":", 1)
-        else:
-            origin_channel, origin_chat_id = "cli", msg.chat_id
+        origin_channel, origin_chat_id, session_key = _parse_system_chat_id(msg.chat_id)
+        session = await self.sessions.get_or_create_async(session_key)
 
-        session_key = f"{origin_channel}:{origin_chat_id}"
-        session = self.sessions.get_or_create(session_key)
-
-        chosen_model: str | None = None
-        try:
-            m = session.metadata.get("model")
-            if isinstance(m, str) and m.strip():
-                chosen_model = m.strip()
-        except Exception:
-            chosen_model = None
+        chosen_model = _model_name(session.metadata.get("model"))
 
         # Build a minimal message list: system prompt + recent history + the announce
         system_prompt = (
@@ -914,7 +989,8 @@ class AgentLoop:
 
         # Single LLM call — no tools, no tool loop
         try:
-            response = await self.provider.chat(
+            response = await self._llm_cache.get_or_call(
+                self.provider.chat,
                 messages=messages,
                 tools=None,
                 model=(chosen_model or "").strip() or self.model,
@@ -929,7 +1005,7 @@ class AgentLoop:
 
         session.add_message("user", f"[System: {msg.sender_id}] {msg.content}")
         session.add_message("assistant", final_content)
-        await self.sessions.save_async(session)
+        self.sessions.save_background(session)
 
         return OutboundMessage(
             channel=origin_channel,
@@ -5,6 +5,7 @@ from __future__ import annotations
 import hashlib
 import re
 import sqlite3
+import threading
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
@@ -40,14 +41,54 @@ def _split_into_chunks(text: str) -> list[str]:
     return chunks
 
 
+# Filler words that match almost every memory chunk and only add bm25 scoring work. Tokens
+# of two characters or fewer ("is", "it", "my", ...) are dropped by _query_terms() outright,
+# so only longer words need listing here.
+_QUERY_STOPWORDS = frozenset(
+    """
+        about after again all also and any are been but can could did does doing for from
+        get got had has have her here him his how into its just know let like not now okay
+        our out please she should some thank thanks that the their them then there these
+        they this those very want was were what when where which who why will with would
+        yes you your
+    """.split()
+)
+
+_QUERY_MAX_TERMS = 16
+
+
+def _query_terms(text: str) -> list[str]:
+    """
+    Distinct lowercase search terms in order of first appearance, minus stopwords and
+    tokens of two characters or fewer (too common to be worth a slot under the term cap).
+
+    Callers put the current message first, so it keeps priority under the term cap.
+    Lowercasing also keeps user text from forming FTS operators (AND/OR/NOT/NEAR).
+    """
+    terms: dict[str, None] = {}
+    for term in re.findall(r"[A-Za-z0-9_]{3,}", text.lower()):
+        if term in _QUERY_STOPWORDS or term in terms:
+            continue
+        terms[term] = None
+        # Cap the number of terms to keep queries fast and deterministic.
+        if len(terms) >= _QUERY_MAX_TERMS:
+            break
+    return list(terms)
+
+
 def _fts_query_from_text(text: str) -> str:
     # Avoid FTS query syntax injection: extract alnum tokens and OR them.
-    terms = re.findall(r"[A-Za-z0-9_]{2,}", text)
-    if not terms:
-        return ""
-    # Cap the number of terms to keep queries fast and deterministic.
-    terms = terms[:16]
-    return " OR ".join(terms)
+    return " OR ".join(_query_terms(text))
+
+
+def _content_expr(column: str, max_chars: int | None) -> str:
+    """SQL expression for `column`, truncated to max_chars with a '...' marker."""
+    if not max_chars or max_chars <= 0:
+        return column
+    n = int(max_chars)
+    return (
+        f"CASE WHEN length({column}) > {n} THEN substr({column}, 1, {n}) || '...' ELSE {column} END"
+    )
 
 
 @dataclass(frozen=True)
@@ -61,13 +102,24 @@ class MemoryDB:
     def __init__(self, db_path: Path):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # One connection per thread, kept open so sqlite3's per-connection statement cache
+        # (and the PRAGMA setup) is reused across calls instead of re-prepared every time.
+        self._local = threading.local()
+        # (scope, source_key) -> mtime_ns this process last indexed, so unchanged files are
+        # skipped without touching SQLite.
+        self._ingested_mtimes: dict[tuple[str, str], int] = {}
+        # Cached answer for is_empty(); None means "ask SQLite".
+        self._known_empty: bool | None = None
         self._ensure_schema()
 
     def _connect(self) -> sqlite3.Connection:
-        con = sqlite3.connect(self.db_path, timeout=3.0)
-        con.execute("PRAGMA journal_mode=WAL;")
-        con.execute("PRAGMA synchronous=NORMAL;")
-        con.execute("PRAGMA busy_timeout=3000;")
+        con = getattr(self._local, "con", None)
+        if con is None:
+            con = sqlite3.connect(self.db_path, timeout=3.0)
+            con.execute("PRAGMA journal_mode=WAL;")
+            con.execute("PRAGMA synchronous=NORMAL;")
+            con.execute("PRAGMA busy_timeout=3000;")
+            self._local.con = con
         return con
 
     def _ensure_schema(self) -> None:
@@ -140,59 +192,104 @@ class MemoryDB:
 
     def _get_mtime_ns(self, path: Path) -> int:
         try:
-            return path.stat().st_mtime_ns if path.exists() else 0
-        except Exception:
+            return path.stat().st_mtime_ns
+        except OSError:
             return 0
 
     def ingest_file_if_changed(self, *, scope: str, source_key: str, path: Path) -> None:
         """
         Index a file under a scope. If the file hasn't changed (mtime_ns), do nothing.
         """
-        mtime_ns = self._get_mtime_ns(path)
+        self.ingest_many([(scope, source_key, path)])
+
+    def ingest_many(self, sources: list[tuple[str, str, Path]]) -> None:
+        """
+        Index several (scope, source_key, path) files in a single transaction.
+
+        Unchanged files (same mtime_ns) are skipped, as in ingest_file_if_changed().
+        """
+        changed: list[tuple[str, str, Path, int]] = []
+        for scope, source_key, path in sources:
+            mtime_ns = self._get_mtime_ns(path)
+            if self._ingested_mtimes.get((scope, source_key)) != mtime_ns:
+                changed.append((scope, source_key, path, mtime_ns))
+        if not changed:
+            return
+
         now = _utc_now_iso()
         with self._connect() as con:
-            row = con.execute(
-                "SELECT mtime_ns FROM memory_sources WHERE scope=? AND source=? AND source_key=?",
-                (scope, "file", source_key),
-            ).fetchone()
-            if row and int(row[0]) == int(mtime_ns):
-                return
-
-            # Replace all entries for this source.
-            con.execute(
-                "DELETE FROM memory_entries WHERE scope=? AND source=? AND source_key=?",
-                (scope, "file", source_key),
-            )
+            con.execute("BEGIN IMMEDIATE")
+            for scope, source_key, path, mtime_ns in changed:
+                self._ingest_file(
+                    con, scope=scope, source_key=source_key, path=path, mtime_ns=mtime_ns, now=now
+                )
+        for scope, source_key, _, mtime_ns in changed:
+            self._ingested_mtimes[(scope, source_key)] = mtime_ns
+        self._known_empty = None
 
-            text = ""
-            try:
-                if path.exists() and path.is_file():
-                    text = path.read_text(encoding="utf-8", errors="replace")
-            except Exception:
-                text = ""
+    def is_empty(self) -> bool:
+        """Whether the index holds no entries at all (cached until the next ingest)."""
+        if self._known_empty is None:
+            with self._connect() as con:
+                row = con.execute("SELECT 1 FROM memory_entries LIMIT 1").fetchone()
+            self._known_empty = row is None
+        return self._known_empty
 
-            chunks = _split_into_chunks(text) if text else []
-            for c in chunks:
-                con.execute(
-                    """
-                    INSERT OR IGNORE INTO memory_entries
-                      (scope, source, source_key, content, content_hash, created_at, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (scope, "file", source_key, c, _hash_text(c), now, now),
-                )
+    def _ingest_file(
+        self,
+        con: sqlite3.Connection,
+        *,
+        scope: str,
+        source_key: str,
+        path: Path,
+        mtime_ns: int,
+        now: str,
+    ) -> None:
+        row = con.execute(
+            "SELECT mtime_ns FROM memory_sources WHERE scope=? AND source=? AND source_key=?",
+            (scope, "file", source_key),
+        ).fetchone()
+        if row and int(row[0]) == int(mtime_ns):
+            return
+
+        # Replace all entries for this source.
+        con.execute(
+            "DELETE FROM memory_entries WHERE scope=? AND source=? AND source_key=?",
+            (scope, "file", source_key),
+        )
 
+        text = ""
+        try:
+            if path.exists() and path.is_file():
+                text = path.read_text(encoding="utf-8", errors="replace")
+        except Exception:
+            text = ""
+
+        chunks = _split_into_chunks(text) if text else []
+        for c in chunks:
             con.execute(
                 """
-                INSERT INTO memory_sources(scope, source, source_key, mtime_ns, updated_at)
-                VALUES (?, ?, ?, ?, ?)
-                ON CONFLICT(scope, source, source_key)
-                DO UPDATE SET mtime_ns=excluded.mtime_ns, updated_at=excluded.updated_at
+                INSERT OR IGNORE INTO memory_entries
+                  (scope, source, source_key, content, content_hash, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
                 """,
-                (scope, "file", source_key, int(mtime_ns), now),
+                (scope, "file", source_key, c, _hash_text(c), now, now),
             )
 
-    def search(self, *, scope: str, query_text: str, limit: int = 8) -> list[MemoryHit]:
+        con.execute(
+            """
+            INSERT INTO memory_sources(scope, source, source_key, mtime_ns, updated_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(scope, source, source_key)
+            DO UPDATE SET mtime_ns=excluded.mtime_ns, updated_at=excluded.updated_at
+            """,
+            (scope, "file", source_key, int(mtime_ns), now),
+        )
+
+    def search(
+        self, *, scope: str, query_text: str, limit: int = 8, max_chars: int | None = None
+    ) -> list[MemoryHit]:
+        """Search one scope. Hit content longer than max_chars is truncated by SQLite."""
         q = _fts_query_from_text(query_text)
         if not q:
             return []
@@ -204,9 +301,10 @@ class MemoryDB:
         with self._connect() as con:
             # Prefer FTS if available.
             try:
+                content = _content_expr("memory_entries.content", max_chars)
                 rows = con.execute(
-                    """
-                    SELECT memory_entries.source_key, memory_entries.content
+                    f"""
+                    SELECT memory_entries.source_key, {content}
                     FROM memory_entries_fts
                     JOIN memory_entries ON memory_entries_fts.rowid = memory_entries.id
                     WHERE memory_entries.scope = ?
@@ -219,14 +317,15 @@ class MemoryDB:
                 return [MemoryHit(scope=scope, source_key=r[0], content=r[1]) for r in rows]
             except sqlite3.OperationalError:
                 # Fall back to LIKE with tokenised OR (mirrors _fts_query_from_text).
-                terms = re.findall(r"[A-Za-z0-9_]{2,}", query_text)[:16]
+                terms = _query_terms(query_text)
                 if not terms:
                     return []
                 where = " OR ".join(["content LIKE ?"] * len(terms))
                 params: list[str | int] = [scope] + ["%" + t + "%" for t in terms] + [limit]
+                content = _content_expr("content", max_chars)
                 rows = con.execute(
                     f"""
-                    SELECT source_key, content
+                    SELECT source_key, {content}
                     FROM memory_entries
                     WHERE scope = ? AND ({where})
                     LIMIT ?
@@ -234,3 +333,66 @@ class MemoryDB:
                     params,
                 ).fetchall()
                 return [MemoryHit(scope=scope, source_key=r[0], content=r[1]) for r in rows]
+
+    def search_multi(
+        self,
+        *,
+        scopes: list[str],
+        query_text: str,
+        limit_per_scope: int = 8,
+        max_chars: int | None = None,
+    ) -> list[MemoryHit]:
+        """
+        Search several scopes with one query, keeping the top `limit_per_scope` hits per scope.
+
+        Hits are returned grouped in the order of `scopes`, best match first.
+        """
+        q = _fts_query_from_text(query_text)
+        limit = max(int(limit_per_scope), 0)
+        scopes = list(dict.fromkeys(scopes))
+        if not q or limit <= 0 or not scopes:
+            return []
+
+        placeholders = ", ".join(["?"] * len(scopes))
+        content = _content_expr("memory_entries.content", max_chars)
+        with self._connect() as con:
+            try:
+                rows = con.execute(
+                    f"""
+                    SELECT scope, source_key, content FROM (
+                      SELECT scope, source_key, content,
+                             ROW_NUMBER() OVER (PARTITION BY scope ORDER BY score) AS rn
+                      FROM (
+                        SELECT memory_entries.scope AS scope,
+                               memory_entries.source_key AS source_key,
+                               {content} AS content,
+                               bm25(memory_entries_fts) AS score
+                        FROM memory_entries_fts
+                        JOIN memory_entries ON memory_entries_fts.rowid = memory_entries.id
+                        WHERE memory_entries.scope IN ({placeholders})
+                          AND memory_entries_fts MATCH ?
+                      )
+                    )
+                    WHERE rn <= ?
+                    ORDER BY rn
+                    """,
+                    (*scopes, q, limit),
+                ).fetchall()
+            except sqlite3.OperationalError:
+                rows = None
+
+        if rows is None:
+            # FTS not available: fall back to one LIKE search per scope.
+            hits: list[MemoryHit] = []
+            for scope in scopes:
+                hits.extend(
+                    self.search(
+                        scope=scope, query_text=query_text, limit=limit, max_chars=max_chars
+                    )
+                )
+            return hits
+
+        by_scope: dict[str, list[MemoryHit]] = {scope: [] for scope in scopes}
+        for scope, source_key, content in rows:
+            by_scope[scope].append(MemoryHit(scope=scope, source_key=source_key, content=content))
+        return [hit for scope in scopes for hit in by_scope[scope]]
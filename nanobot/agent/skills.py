@@ -22,8 +22,9 @@ class SkillsLoader:
         self.workspace = workspace
         self.workspace_skills = workspace / "skills"
         self.builtin_skills = builtin_skills_dir or BUILTIN_SKILLS_DIR
-        self._metadata_cache: dict[str, tuple[float, dict]] = {}
-        self._content_cache: dict[str, tuple[float, str]] = {}
+        # path -> (mtime_ns, value)
+        self._metadata_cache: dict[str, tuple[int, dict]] = {}
+        self._content_cache: dict[str, tuple[int, str]] = {}
 
     def resolve_skill_path(self, name: str) -> Path | None:
         """Resolve a skill name to its SKILL.md path."""
@@ -89,9 +90,9 @@ class SkillsLoader:
 
         key = str(path)
         try:
-            mtime = path.stat().st_mtime
+            mtime = path.stat().st_mtime_ns
         except Exception:
-            mtime = 0.0
+            mtime = 0
 
         cached = self._content_cache.get(key)
         if cached and cached[0] == mtime:
@@ -263,9 +264,9 @@ class SkillsLoader:
 
         key = str(path)
         try:
-            mtime = path.stat().st_mtime
+            mtime = path.stat().st_mtime_ns
         except Exception:
-            mtime = 0.0
+            mtime = 0
 
         cached = self._metadata_cache.get(key)
         if cached and cached[0] == mtime:
@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import time
 import uuid
 from pathlib import Path
@@ -15,7 +14,7 @@ from nanobot.agent.tools.filesystem import EditFileTool, ListDirTool, ReadFileTo
 from nanobot.agent.tools.registry import ToolRegistry
 from nanobot.agent.tools.shell import ExecTool
 from nanobot.agent.tools.web import FirecrawlScrapeTool, WebFetchTool, WebSearchTool
-from nanobot.agent.utils import is_tool_error
+from nanobot.agent.utils import dumps_compact, is_tool_error
 from nanobot.bus.events import InboundMessage, OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.providers.base import LLMProvider
@@ -373,12 +372,14 @@ class SubagentManager:
         if meta:
             meta["tool_log"] = []
 
+        tool_defs = tools.get_definitions()
+
         while iteration < max_iterations:
             iteration += 1
 
             response = await self.provider.chat(
                 messages=messages,
-                tools=tools.get_definitions(),
+                tools=tool_defs,
                 model=self.model,
                 use_fallbacks=self.use_fallbacks,
             )
@@ -400,7 +401,7 @@ class SubagentManager:
                         "type": "function",
                         "function": {
                             "name": tc.name,
-                            "arguments": json.dumps(tc.arguments),
+                            "arguments": tc.raw_arguments or dumps_compact(tc.arguments),
                         },
                     }
                     for tc in response.tool_calls
@@ -416,15 +417,21 @@ class SubagentManager:
                 results = await tools.execute_calls(response.tool_calls, allow_parallel=True)
                 abort_loop = False
                 for tool_call, result in zip(response.tool_calls, results):
-                    logger.debug(f"Subagent [{task_id}] executing: {tool_call.name}")
-                    messages.append(
-                        {
-                            "role": "tool",
-                            "tool_call_id": tool_call.id,
-                            "name": tool_call.name,
-                            "content": result,
-                        }
-                    )
+                    logger.debug("Subagent [{}] executing: {}", task_id, tool_call.name)
+                    if self._context_builder is not None:
+                        # Same compaction and size cap as the main agent loop.
+                        self._context_builder.add_tool_result(
+                            messages, tool_call.id, tool_call.name, result
+                        )
+                    else:
+                        messages.append(
+                            {
+                                "role": "tool",
+                                "tool_call_id": tool_call.id,
+                                "name": tool_call.name,
+                                "content": result,
+                            }
+                        )
 
                     # Tool log entry
                     if meta is not None:
@@ -652,7 +659,13 @@ When you have completed the task, provide a clear summary of your findings or ac
             "using the `write_file` tool. This persists across sessions."
         )
 
-        # --- 6. Spawn context ---
+        # --- 6. Tool result format (tool results are compacted like the main loop's) ---
+        if self._context_builder.tool_serializer == "toon":
+            from nanobot.agent.toon import TOON_PROMPT_NOTE
+
+            sections.append(f"## Tool Results\n\n{TOON_PROMPT_NOTE}")
+
+        # --- 7. Spawn context ---
         if context:
             sections.append("# Conversation Context\n\n" + context[:context_budget])
 
@@ -202,6 +202,8 @@ class EditFileTool(Tool):
 class ListDirTool(Tool):
     """Tool to list directory contents."""
 
+    parallel_safe = True
+
     def __init__(self, workspace_root: Path | None = None, restrict_to_workspace: bool = False):
         self.workspace_root = workspace_root
         self.restrict_to_workspace = restrict_to_workspace
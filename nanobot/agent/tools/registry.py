@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import time
 from collections import OrderedDict
 from dataclasses import dataclass
@@ -31,10 +32,17 @@ class ToolRegistry:
         self._max_parallel = max(int(max_parallel), 1)
         self._cache: "OrderedDict[str, _CacheEntry]" = OrderedDict()
         self._in_flight: dict[str, asyncio.Future[str]] = {}
+        # Memoized get_definitions(); reset whenever the tool set or allowlist changes.
+        self._definitions: list[dict[str, Any]] | None = None
+        # Bumped on every (un)registration so registries derived from this one can tell
+        # when they are stale.
+        self.generation = 0
 
     def register(self, tool: Tool) -> None:
         """Register a tool."""
         self._tools[tool.name] = tool
+        self._definitions = None
+        self.generation += 1
 
     def iter_tools(self) -> list[Tool]:
         """Return registered tool instances (in insertion order)."""
@@ -43,6 +51,8 @@ class ToolRegistry:
     def unregister(self, name: str) -> None:
         """Unregister a tool by name."""
         self._tools.pop(name, None)
+        self._definitions = None
+        self.generation += 1
 
     def get(self, name: str) -> Tool | None:
         """Get a tool by name."""
@@ -53,11 +63,17 @@ class ToolRegistry:
         return name in self._tools
 
     def get_definitions(self) -> list[dict[str, Any]]:
-        """Get all tool definitions in OpenAI format."""
-        tools = self._tools.values()
-        if self._allowed_tools is not None:
-            tools = [tool for tool in tools if tool.name in self._allowed_tools]
-        return [tool.to_schema() for tool in tools]
+        """
+        Get all tool definitions in OpenAI format.
+
+        The list is built once and shared until the registry changes; treat it as read-only.
+        """
+        if self._definitions is None:
+            tools = self._tools.values()
+            if self._allowed_tools is not None:
+                tools = [tool for tool in tools if tool.name in self._allowed_tools]
+            self._definitions = [tool.to_schema() for tool in tools]
+        return self._definitions
 
     def _tool_parallel_safe(self, name: str) -> bool:
         tool = self._tools.get(name)
@@ -212,11 +228,25 @@ class ToolRegistry:
                 j = i + 1
                 while j < len(tool_calls) and self._tool_parallel_safe(tool_calls[j].name):
                     j += 1
-                chunk = tool_calls[i:j]
-                tasks = [asyncio.create_task(_run_one(c)) for c in chunk]
+                # Parallel-safe tools are read-only, so identical calls in one chunk (models
+                # sometimes repeat a read) run once and share the result.
+                unique: dict[str, int] = {}
+                slots: list[int] = []
+                tasks = []
+                for c in tool_calls[i:j]:
+                    # Reuse the provider's JSON when it sent one instead of re-serializing.
+                    args = getattr(c, "raw_arguments", None) or json.dumps(
+                        c.arguments, sort_keys=True, default=str
+                    )
+                    key = f"{c.name}:{args}"
+                    slot = unique.get(key)
+                    if slot is None:
+                        slot = unique[key] = len(tasks)
+                        tasks.append(asyncio.create_task(_run_one(c)))
+                    slots.append(slot)
                 chunk_results = await asyncio.gather(*tasks)
-                for k, r in enumerate(chunk_results):
-                    results[i + k] = r
+                for k, slot in enumerate(slots):
+                    results[i + k] = chunk_results[slot]
                 i = j
             else:
                 results[i] = await self.execute(call.name, call.arguments)
@@ -231,6 +261,7 @@ class ToolRegistry:
 
     def set_allowed_tools(self, allowed: list[str] | None) -> None:
         """Restrict available tools to an allowlist (None = no restriction)."""
+        self._definitions = None
         if allowed is None:
             self._allowed_tools = None
             return
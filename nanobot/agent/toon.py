@@ -0,0 +1,110 @@
+"""Compact TOON-style (Token-Oriented Object Notation) encoding for JSON tool results."""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any
+
+# One-line explanation of the format, added to the system prompt when it is enabled.
+TOON_PROMPT_NOTE = (
+    "Tool results that were JSON may be shown in compact TOON form: `key: value` lines, "
+    "indentation for nesting, and `name[N]{a,b}:` headers followed by one comma-separated "
+    "row per item."
+)
+
+_NEEDS_QUOTES = re.compile(r'[,:"\\\[\]{}#|\n\r\t]|^[-\s]|\s$')
+_NUMBER = re.compile(r"^-?\d+(\.\d+)?([eE][+-]?\d+)?$")
+
+
+def _scalar(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return json.dumps(value)
+    s = str(value)
+    if not s or s in ("true", "false", "null") or _NUMBER.match(s) or _NEEDS_QUOTES.search(s):
+        return json.dumps(s, ensure_ascii=False)
+    return s
+
+
+def _is_scalar(value: Any) -> bool:
+    return value is None or isinstance(value, (str, int, float, bool))
+
+
+def _table_fields(items: list[Any]) -> list[str] | None:
+    """Field names if items are same-shaped dicts of scalars (TOON's tabular form)."""
+    if not items or not all(isinstance(it, dict) for it in items):
+        return None
+    fields = list(items[0])
+    if not fields:
+        return None
+    for it in items:
+        if list(it) != fields or not all(_is_scalar(v) for v in it.values()):
+            return None
+    return fields
+
+
+def _encode(value: Any, key: str | None, depth: int, out: list[str]) -> None:
+    pad = "  " * depth
+    label = _scalar(key) if key is not None else ""
+
+    if isinstance(value, dict):
+        if key is not None:
+            out.append(f"{pad}{label}:")
+            depth += 1
+        for k, v in value.items():
+            _encode(v, str(k), depth, out)
+        return
+
+    if isinstance(value, list):
+        n = len(value)
+        if all(_is_scalar(v) for v in value):
+            row = ",".join(_scalar(v) for v in value)
+            out.append(f"{pad}{label}[{n}]:" + (f" {row}" if row else ""))
+            return
+        fields = _table_fields(value)
+        if fields is not None:
+            out.append(f"{pad}{label}[{n}]{{{','.join(_scalar(f) for f in fields)}}}:")
+            for it in value:
+                out.append(f"{pad}  " + ",".join(_scalar(it[f]) for f in fields))
+            return
+        out.append(f"{pad}{label}[{n}]:")
+        for it in value:
+            if _is_scalar(it):
+                out.append(f"{pad}  - {_scalar(it)}")
+            else:
+                out.append(f"{pad}  -")
+                _encode(it, None, depth + 2, out)
+        return
+
+    out.append(f"{pad}{label}: {_scalar(value)}" if key is not None else pad + _scalar(value))
+
+
+def to_toon(value: Any) -> str:
+    """Encode a JSON-compatible value as TOON text."""
+    out: list[str] = []
+    _encode(value, None, 0, out)
+    return "\n".join(out)
+
+
+def compact_tool_result(result: str) -> str:
+    """
+    Re-encode a JSON object/array tool result as TOON when that is shorter.
+
+    Anything else (plain text, scalars, invalid JSON) is returned unchanged.
+    """
+    head = result.lstrip()[:1]
+    if head not in ("{", "["):
+        return result
+    try:
+        value = json.loads(result)
+    except ValueError:
+        return result
+    if not isinstance(value, (dict, list)):
+        return result
+    encoded = to_toon(value)
+    # An empty object encodes to "", which would reach the model as an empty tool message.
+    return encoded if encoded and len(encoded) < len(result) else result
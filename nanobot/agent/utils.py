@@ -2,8 +2,38 @@
 
 from __future__ import annotations
 
+import json
+import re
+from typing import Any
+
+try:  # Optional C encoder (`pip install nanobot-ai[speedups]`).
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Anchored at the start, so only the leading whitespace and prefix are ever scanned.
+_TOOL_ERROR_PREFIX = re.compile(r"\s*(?:error|warning):", re.IGNORECASE)
+
 
 def is_tool_error(result: str) -> bool:
     """Check whether a tool result string indicates an error or warning."""
-    s = result.strip().lower()
-    return s.startswith("error:") or s.startswith("warning:")
+    return _TOOL_ERROR_PREFIX.match(result) is not None
+
+
+def dumps_compact(value: Any) -> str:
+    """
+    Serialize a JSON value without whitespace, keeping non-ASCII text as-is.
+
+    Uses orjson when installed, else the stdlib. The two agree on strings, ints and
+    structure but not on every float: orjson writes exponents without "+" (``1e16``
+    vs ``1e+16``) and emits NaN/Infinity as ``null``, where the stdlib writes the
+    non-standard ``NaN``/``Infinity`` tokens. Output is only stable within one
+    environment, which is all callers rely on.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(value).decode()
+        except TypeError:
+            pass  # non-str keys, ints beyond 64 bits, ...
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
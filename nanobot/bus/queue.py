@@ -25,10 +25,29 @@ class MessageBus:
         """Consume the next inbound message (blocks until available)."""
         return await self.inbound.get()
 
+    async def consume_inbound_batch(self, max_n: int = 32) -> list[InboundMessage]:
+        """
+        Consume the next inbound message plus any already queued behind it.
+
+        Blocks until at least one message is available, then drains up to max_n
+        without waiting again.
+        """
+        batch = [await self.inbound.get()]
+        while len(batch) < max_n:
+            try:
+                batch.append(self.inbound.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return batch
+
     async def publish_outbound(self, msg: OutboundMessage) -> None:
         """Publish a response from the agent to channels."""
         await self.outbound.put(msg)
 
+    def publish_outbound_nowait(self, msg: OutboundMessage) -> None:
+        """Publish a response without yielding to the event loop (outbound is unbounded)."""
+        self.outbound.put_nowait(msg)
+
     async def consume_outbound(self) -> OutboundMessage:
         """Consume the next outbound message (blocks until available)."""
         return await self.outbound.get()
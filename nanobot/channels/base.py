@@ -18,6 +18,8 @@ class BaseChannel(ABC):
 
     name: str = "base"
     max_message_chars: int | None = None
+    # Whether send() can render streamed partial replies (outbound metadata type "delta").
+    supports_streaming: bool = False
 
     def __init__(self, config: Any, bus: MessageBus):
         """
@@ -128,6 +128,9 @@ class ChannelManager:
 
                 channel = self.channels.get(msg.channel)
                 if channel:
+                    # Partial replies only go to channels that can update them in place.
+                    if msg.metadata.get("type") == "delta" and not channel.supports_streaming:
+                        continue
                     try:
                         await channel.send(msg)
                     except Exception as e:
@@ -65,6 +65,7 @@ class WebUIChannel(BaseChannel):
 
     name = "webui"
     max_message_chars = None
+    supports_streaming = True
 
     _log_sink_id: int | None = None
     _log_buffer: "deque[str]" = deque(maxlen=2000)
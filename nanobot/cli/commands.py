@@ -4,6 +4,7 @@ import asyncio
 import os
 import sys
 from pathlib import Path
+from typing import Any
 
 import typer
 from rich.console import Console
@@ -21,6 +22,15 @@ app = typer.Typer(
 console = Console()
 
 
+def _run_async(main: Any) -> Any:
+    """Run a coroutine to completion, on uvloop when the speedups extra is installed."""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(main)
+    return uvloop.run(main)
+
+
 def _prompt_optional_secret(label: str) -> str:
     """
     Prompt for a secret value (API key), allowing blank to skip.
@@ -785,7 +795,7 @@ def gateway(
                 *(t for t in (agent_task, channels_task) if t is not None), return_exceptions=True
             )
 
-    asyncio.run(run())
+    _run_async(run())
 
 
 # ============================================================================
@@ -848,8 +858,9 @@ def agent(
         async def run_once():
             response = await agent_loop.process_direct(message, session_id, media=media or None)
             console.print(f"\n{__logo__} {response}")
+            await agent_loop.sessions.flush()
 
-        asyncio.run(run_once())
+        _run_async(run_once())
     else:
         # Interactive mode
         console.print(f"{__logo__} Interactive mode (Ctrl+C to exit)\n")
@@ -866,8 +877,9 @@ def agent(
                 except KeyboardInterrupt:
                     console.print("\nGoodbye!")
                     break
+            await agent_loop.sessions.flush()
 
-        asyncio.run(run_interactive())
+        _run_async(run_interactive())
 
 
 # ============================================================================
@@ -1303,7 +1315,7 @@ def cron_run(
     async def run():
         return await service.run_job(job_id, force=force)
 
-    if asyncio.run(run()):
+    if _run_async(run()):
         console.print("[green]✓[/green] Job executed")
     else:
         console.print(f"[red]Failed to run job {job_id}[/red]")
@@ -122,6 +122,20 @@ class AgentDefaults(BaseModel):
     skills_max_chars: int = 12000
     bootstrap_max_chars: int = 4000
     history_max_chars: int = 80000
+    # Send the stable system-prompt prefix as a separate part with an Anthropic-style
+    # cache_control breakpoint (ignored by providers without prompt caching).
+    prompt_cache_control: bool = False
+    # Tool result encoding sent back to the model: "json" (as returned by the tool) or
+    # "toon" (JSON objects/arrays re-encoded in compact TOON form when shorter).
+    tool_serializer: str = "json"
+    # Tool results longer than this keep only their head and tail in the prompt (0 disables).
+    tool_result_max_chars: int = 50000
+    # Max in-memory responses kept for identical temperature-0 LLM requests (0 disables).
+    llm_cache_entries: int = 512
+    # Seconds a cached LLM response stays valid (0 keeps it until evicted).
+    llm_cache_ttl_s: int = 3600
+    # Stream assistant text to channels that can render partial replies (e.g. the web UI).
+    stream_responses: bool = False
     # Subagent prompt budgets (characters)
     subagent_bootstrap_chars: int = 3000
     subagent_context_chars: int = 3000
@@ -1,9 +1,13 @@
 """Base LLM provider interface."""
 
 from abc import ABC, abstractmethod
+from collections.abc import Callable
 from dataclasses import dataclass, field
 from typing import Any
 
+# Receives each chunk of assistant text as it arrives. Called inline, so it must not block.
+DeltaCallback = Callable[[str], None]
+
 
 @dataclass
 class ToolCallRequest:
@@ -12,6 +16,9 @@ class ToolCallRequest:
     id: str
     name: str
     arguments: dict[str, Any]
+    # The provider's original JSON encoding of `arguments`, when it sent one that parsed.
+    # Echoed back verbatim in the assistant message instead of re-serializing.
+    raw_arguments: str | None = None
 
 
 @dataclass
@@ -60,6 +67,7 @@ class LLMProvider(ABC):
         max_tokens: int = 4096,
         temperature: float = 0.7,
         use_fallbacks: bool = True,
+        prompt_cache_key: str | None = None,
     ) -> LLMResponse:
         """
         Send a chat completion request.
@@ -70,12 +78,49 @@ class LLMProvider(ABC):
             model: Model identifier (provider-specific).
             max_tokens: Maximum tokens in response.
             temperature: Sampling temperature.
+            use_fallbacks: Allow the provider to retry with fallback models.
+            prompt_cache_key: Routing hint for providers with automatic prompt caching;
+                requests sharing a key share a cached prompt prefix.
 
         Returns:
             LLMResponse with content and/or tool calls.
         """
         pass
 
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        use_fallbacks: bool = True,
+        prompt_cache_key: str | None = None,
+        *,
+        on_delta: DeltaCallback,
+    ) -> LLMResponse:
+        """
+        Like chat(), but pass assistant text to `on_delta` as it is generated.
+
+        The complete response is still returned at the end. Providers without streaming
+        support fall back to chat() and deliver the whole content as a single delta.
+        """
+        kwargs: dict[str, Any] = {}
+        if prompt_cache_key:
+            kwargs["prompt_cache_key"] = prompt_cache_key
+        response = await self.chat(
+            messages,
+            tools=tools,
+            model=model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            use_fallbacks=use_fallbacks,
+            **kwargs,
+        )
+        if response.content:
+            on_delta(response.content)
+        return response
+
     @abstractmethod
     def get_default_model(self) -> str:
         """Get the default model for this provider."""
@@ -6,7 +6,13 @@ from typing import Any
 
 import httpx
 
-from nanobot.providers.base import LLMError, LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.providers.base import (
+    DeltaCallback,
+    LLMError,
+    LLMProvider,
+    LLMResponse,
+    ToolCallRequest,
+)
 
 _RETRYABLE_STATUS_CODES = frozenset({408, 429, 502, 503})
 
@@ -52,15 +58,16 @@ class OpenRouterProvider(LLMProvider):
             )
         return self._client
 
-    async def chat(
+    def _build_body(
         self,
         messages: list[dict[str, Any]],
-        tools: list[dict[str, Any]] | None = None,
-        model: str | None = None,
-        max_tokens: int = 4096,
-        temperature: float = 0.7,
-        use_fallbacks: bool = True,
-    ) -> LLMResponse:
+        tools: list[dict[str, Any]] | None,
+        model: str | None,
+        max_tokens: int,
+        temperature: float,
+        use_fallbacks: bool,
+        prompt_cache_key: str | None,
+    ) -> dict[str, Any]:
         model = model or self.default_model
 
         body: dict[str, Any] = {
@@ -73,6 +80,8 @@ class OpenRouterProvider(LLMProvider):
         if tools:
             body["tools"] = tools
             body["tool_choice"] = "auto"
+        if prompt_cache_key:
+            body["prompt_cache_key"] = prompt_cache_key
 
         # Model fallbacks: if the primary model errors, OpenRouter tries the next.
         if use_fallbacks:
@@ -81,6 +90,21 @@ class OpenRouterProvider(LLMProvider):
                 body["models"] = [model] + fallbacks
                 body["route"] = "fallback"
 
+        return body
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        use_fallbacks: bool = True,
+        prompt_cache_key: str | None = None,
+    ) -> LLMResponse:
+        body = self._build_body(
+            messages, tools, model, max_tokens, temperature, use_fallbacks, prompt_cache_key
+        )
         client = self._get_client()
         last_error: LLMError | None = None
 
@@ -131,6 +155,83 @@ class OpenRouterProvider(LLMProvider):
             "Unknown error after retries", status_code=None, retryable=False
         )
 
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        use_fallbacks: bool = True,
+        prompt_cache_key: str | None = None,
+        *,
+        on_delta: DeltaCallback,
+    ) -> LLMResponse:
+        body = self._build_body(
+            messages, tools, model, max_tokens, temperature, use_fallbacks, prompt_cache_key
+        )
+        body["stream"] = True
+        client = self._get_client()
+        last_error: LLMError | None = None
+
+        for attempt in range(1 + self.max_retries):
+            stream = _StreamAccumulator()
+            try:
+                async with client.stream("POST", self._completions_url, json=body) as resp:
+                    if resp.status_code >= 400:
+                        raw = await resp.aread()
+                        try:
+                            error_body = json.loads(raw)
+                        except ValueError:
+                            error_body = raw.decode("utf-8", errors="replace")
+                        llm_err = self._build_llm_error(resp.status_code, error_body)
+                        if llm_err.retryable and attempt < self.max_retries:
+                            last_error = llm_err
+                            await asyncio.sleep(2**attempt)
+                            continue
+                        raise llm_err
+
+                    async for line in resp.aiter_lines():
+                        # SSE: "data: {...}" events; ":"-prefixed lines are keep-alive comments.
+                        if not line.startswith("data:"):
+                            continue
+                        data = line[5:].strip()
+                        if data == "[DONE]":
+                            break
+                        try:
+                            chunk = json.loads(data)
+                        except ValueError:
+                            continue
+                        if isinstance(chunk.get("error"), dict):
+                            raise self._build_llm_error(
+                                int(chunk["error"].get("code") or 500), chunk
+                            )
+                        text = stream.add(chunk)
+                        if text:
+                            on_delta(text)
+
+                return self._parse_response(stream.result())
+
+            except LLMError:
+                raise
+
+            except httpx.HTTPError as exc:
+                timed_out = isinstance(exc, httpx.TimeoutException)
+                last_error = LLMError(
+                    message=f"Request timed out: {exc}" if timed_out else f"HTTP error: {exc}",
+                    status_code=408 if timed_out else None,
+                    retryable=True,
+                )
+                # Text already shown to the user can't be taken back, so only retry before it.
+                if not stream.emitted and attempt < self.max_retries:
+                    await asyncio.sleep(2**attempt)
+                    continue
+                raise last_error from exc
+
+        raise last_error or LLMError(
+            "Unknown error after retries", status_code=None, retryable=False
+        )
+
     @staticmethod
     def _parse_response(data: dict[str, Any]) -> LLMResponse:
         choices = data.get("choices") or []
@@ -144,9 +245,10 @@ class OpenRouterProvider(LLMProvider):
         for tc in message.get("tool_calls") or []:
             fn = tc.get("function") or {}
             args = fn.get("arguments", "{}")
+            raw_args = None
             if isinstance(args, str):
                 try:
-                    args = json.loads(args)
+                    args, raw_args = json.loads(args), args
                 except json.JSONDecodeError:
                     args = {"raw": args}
             tool_calls.append(
@@ -154,6 +256,7 @@ class OpenRouterProvider(LLMProvider):
                     id=tc.get("id", ""),
                     name=fn.get("name", ""),
                     arguments=args,
+                    raw_arguments=raw_args,
                 )
             )
 
@@ -198,3 +301,55 @@ class OpenRouterProvider(LLMProvider):
         if self._client and not self._client.is_closed:
             await self._client.aclose()
             self._client = None
+
+
+class _StreamAccumulator:
+    """Folds streamed chat completion chunks back into a non-streamed response payload."""
+
+    def __init__(self) -> None:
+        self.emitted = False
+        self._content: list[str] = []
+        self._tool_calls: dict[int, dict[str, Any]] = {}
+        self._finish_reason: str | None = None
+        self._usage: dict[str, Any] | None = None
+
+    def add(self, chunk: dict[str, Any]) -> str:
+        """Merge one chunk; return its assistant text (empty if none)."""
+        if chunk.get("usage"):
+            self._usage = chunk["usage"]
+        choices = chunk.get("choices") or []
+        if not choices:
+            return ""
+        choice = choices[0]
+        if choice.get("finish_reason"):
+            self._finish_reason = choice["finish_reason"]
+        delta = choice.get("delta") or {}
+
+        for tc in delta.get("tool_calls") or []:
+            slot = self._tool_calls.setdefault(
+                tc.get("index", len(self._tool_calls)),
+                {"id": "", "function": {"name": "", "arguments": ""}},
+            )
+            if tc.get("id"):
+                slot["id"] = tc["id"]
+            fn = tc.get("function") or {}
+            if fn.get("name"):
+                slot["function"]["name"] += fn["name"]
+            if fn.get("arguments"):
+                slot["function"]["arguments"] += fn["arguments"]
+
+        text = delta.get("content") or ""
+        if text:
+            self._content.append(text)
+            self.emitted = True
+        return text
+
+    def result(self) -> dict[str, Any]:
+        """The accumulated response in the shape _parse_response() expects."""
+        message: dict[str, Any] = {"content": "".join(self._content) or None}
+        if self._tool_calls:
+            message["tool_calls"] = [self._tool_calls[i] for i in sorted(self._tool_calls)]
+        return {
+            "choices": [{"message": message, "finish_reason": self._finish_reason}],
+            "usage": self._usage,
+        }
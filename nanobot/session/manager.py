@@ -3,7 +3,7 @@
 import asyncio
 import json
 import os
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -29,6 +29,12 @@ class Session:
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
     metadata: dict[str, Any] = field(default_factory=dict)
+    # LLM-format entries built by get_history(), keyed by id() of the stored message (which
+    # is kept alongside to guard against id reuse). Stored messages are never edited in place,
+    # so entries can be shared across turns instead of being rebuilt every time.
+    _llm_entries: dict[int, tuple[dict[str, Any], dict[str, Any]]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
 
     def add_message(self, role: str, content: str, **kwargs: Any) -> None:
         """Add a message to the session."""
@@ -55,24 +61,31 @@ class Session:
             # Permanently trim older messages to prevent unbounded session growth.
             self.messages = self.messages[-max_retained:]
             self.updated_at = datetime.now()
+            live = {id(m) for m in self.messages}
+            self._llm_entries = {k: v for k, v in self._llm_entries.items() if k in live}
 
         # Get recent messages
         recent = (
             self.messages[-max_messages:] if len(self.messages) > max_messages else self.messages
         )
 
-        # Convert to LLM format (role, content, and optional media)
+        # Convert to LLM format (role, content, and optional media), reusing earlier conversions.
+        entries = self._llm_entries
         result = []
         for m in recent:
-            entry: dict[str, Any] = {"role": m["role"], "content": m["content"]}
-            if m.get("media"):
-                entry["media"] = m["media"]
-            result.append(entry)
+            cached = entries.get(id(m))
+            if cached is None or cached[0] is not m:
+                entry: dict[str, Any] = {"role": m["role"], "content": m["content"]}
+                if m.get("media"):
+                    entry["media"] = m["media"]
+                cached = entries[id(m)] = (m, entry)
+            result.append(cached[1])
         return result
 
     def clear(self) -> None:
         """Clear all messages in the session."""
         self.messages = []
+        self._llm_entries = {}
         self.updated_at = datetime.now()
 
 
@@ -88,6 +101,9 @@ class SessionManager:
         # Use helper so tests can monkeypatch Path.home().
         self.sessions_dir = ensure_dir(get_sessions_path())
         self._cache: dict[str, Session] = {}
+        # Background saves in flight, and keys that changed again while theirs was running.
+        self._pending_saves: dict[str, asyncio.Task[None]] = {}
+        self._dirty: set[str] = set()
 
     def _get_session_path(self, key: str) -> Path:
         """Get the file path for a session."""
@@ -126,6 +142,19 @@ class SessionManager:
         self._cache[key] = session
         return session
 
+    async def get_or_create_async(self, key: str) -> Session:
+        """
+        Like get_or_create(), but reads a not-yet-cached session file in a thread.
+
+        Cache hits return without leaving the event loop.
+        """
+        session = self._cache.get(key)
+        if session is not None:
+            return session
+        session = await asyncio.to_thread(self._load, key) or Session(key=key)
+        # Another caller may have loaded the same key while we were reading.
+        return self._cache.setdefault(key, session)
+
     def _load(self, key: str) -> Session | None:
         """Load a session from disk."""
         path = self._get_session_path(key)
@@ -200,6 +229,47 @@ class SessionManager:
         await asyncio.to_thread(self._save_to_disk, session)
         self._cache[session.key] = session
 
+    def save_background(self, session: Session) -> None:
+        """
+        Schedule a save without waiting for it, so replies don't wait on disk I/O.
+
+        Saves of the same session are coalesced: while one is running, further calls only
+        mark the session dirty and it is written once more afterwards. Call flush() before
+        the event loop exits.
+        """
+        self._cache[session.key] = session
+        if session.key in self._pending_saves:
+            self._dirty.add(session.key)
+            return
+        task = asyncio.create_task(self._save_coalesced(session.key))
+        self._pending_saves[session.key] = task
+        task.add_done_callback(lambda _t, key=session.key: self._pending_saves.pop(key, None))
+
+    async def _save_coalesced(self, key: str) -> None:
+        written = False
+        while True:
+            self._dirty.discard(key)
+            # Always write the current cached object; it may have been replaced or deleted.
+            session = self._cache.get(key)
+            if session is None:
+                # Deleted meanwhile. A write that was already running must not bring it back.
+                if written:
+                    self._get_session_path(key).unlink(missing_ok=True)
+                return
+            # Snapshot on the event loop; the session may gain messages while the thread writes.
+            snapshot = replace(
+                session, messages=list(session.messages), metadata=dict(session.metadata)
+            )
+            await asyncio.to_thread(self._save_to_disk, snapshot)
+            written = True
+            if key not in self._dirty and self._cache.get(key) is session:
+                return
+
+    async def flush(self) -> None:
+        """Wait for all background saves to finish."""
+        while self._pending_saves:
+            await asyncio.gather(*self._pending_saves.values(), return_exceptions=True)
+
     def _save_to_disk(self, session: Session, _max_retries: int = 2) -> None:
         """Synchronous save implementation (atomic write + fsync) with retry."""
         path = self._get_session_path(session.key)
@@ -248,8 +318,9 @@ class SessionManager:
         Returns:
             True if deleted, False if not found.
         """
-        # Remove from cache
+        # Remove from cache; a background save still in flight sees this and stops.
         self._cache.pop(key, None)
+        self._dirty.discard(key)
 
         # Remove file
         path = self._get_session_path(key)
@@ -208,8 +208,22 @@ export function connect() {
       return;
     }
 
+    if (data.type === "delta") {
+      /* Streamed reply text; the final "assistant" message replaces it. A reset marks
+         the start of a new LLM call in the tool loop, so earlier partial text is dropped. */
+      if (data.data && data.data.reset) state.streamText = "";
+      state.streamText += String(data.content || "");
+      const node = state.thinkingRow && state.thinkingRow.querySelector(".content");
+      if (node && state.streamText) {
+        node.innerHTML = "";
+        node.appendChild(renderMarkdown(state.streamText));
+      }
+      return;
+    }
+
     if (data.type === "status") {
       const c = String(data.content || "").trim();
+      state.streamText = "";
       if (state.thinkingRow && c) {
         const node = state.thinkingRow.querySelector(".content");
         if (node) {
@@ -223,6 +237,7 @@ export function connect() {
     }
 
     if (data.type === "assistant") {
+      state.streamText = "";
       if (state.thinkingRow) {
         state.thinkingRow.remove();
         state.thinkingRow = null;
@@ -273,6 +288,7 @@ export function connect() {
         setStatus("ok", "connected");
         return;
       }
+      state.streamText = "";
       if (state.thinkingRow) {
         state.thinkingRow.remove();
         state.thinkingRow = null;
@@ -70,6 +70,7 @@ export const state = {
   inflight: false,
   t0: 0,
   thinkingRow: null,
+  streamText: "",
   pendingNewChatDefaultModel: false,
   lastHistoryEmpty: true,
   serverHistory: [],
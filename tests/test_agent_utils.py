@@ -0,0 +1,20 @@
+from nanobot.agent import utils
+from nanobot.agent.utils import dumps_compact, is_tool_error
+
+
+def test_dumps_compact_matches_with_and_without_orjson(monkeypatch) -> None:
+    value = {"path": "/tmp/x.txt", "text": "héllo", "n": [1, 2.5, None, True]}
+    expected = '{"path":"/tmp/x.txt","text":"héllo","n":[1,2.5,null,true]}'
+    assert dumps_compact(value) == expected
+
+    monkeypatch.setattr(utils, "orjson", None)
+    assert dumps_compact(value) == expected
+    assert dumps_compact({1: "a"}) == '{"1":"a"}'
+
+
+def test_is_tool_error_checks_only_the_prefix() -> None:
+    assert is_tool_error("Error: boom")
+    assert is_tool_error("\n  WARNING: careful")
+    assert not is_tool_error("ok\nError: later in the output")
+    assert not is_tool_error("errors: none")
+    assert not is_tool_error("")
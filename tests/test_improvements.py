@@ -34,6 +34,15 @@ def test_history_trim_drops_oldest_messages(tmp_path: Path) -> None:
     assert any("C" * 30 in m["content"] for m in trimmed)
 
 
+def test_history_trim_keeps_longest_fitting_suffix(tmp_path: Path) -> None:
+    builder = ContextBuilder(tmp_path, history_max_chars=100)
+    history = [{"role": "user", "content": str(i) * 30} for i in range(6)]
+    trimmed = builder._trim_history(history)
+
+    assert "3 earlier message(s)" in trimmed[0]["content"]
+    assert trimmed[1:] == history[3:]
+
+
 def test_history_trim_noop_when_under_budget(tmp_path: Path) -> None:
     builder = ContextBuilder(tmp_path, history_max_chars=10000)
     history = [
@@ -0,0 +1,147 @@
+import asyncio
+import pathlib
+from typing import Any
+
+from nanobot.agent.llm_cache import LLMCache
+from nanobot.agent.loop import AgentLoop
+from nanobot.bus.queue import MessageBus
+from nanobot.config.schema import AgentDefaults
+from nanobot.providers.base import LLMProvider, LLMResponse
+
+
+class _CountingChat:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def __call__(self, **kwargs: Any) -> LLMResponse:
+        self.calls += 1
+        return LLMResponse(content=f"reply-{self.calls}", usage={"total_tokens": 10})
+
+
+async def test_llm_cache_reuses_greedy_responses() -> None:
+    cache = LLMCache(max_entries=2)
+    chat = _CountingChat()
+    req = dict(messages=[{"role": "user", "content": "hi"}], tools=None, model="m", max_tokens=64)
+
+    first = await cache.get_or_call(chat, temperature=0.0, **req)
+    second = await cache.get_or_call(chat, temperature=0.0, **req)
+    assert second.content == first.content and chat.calls == 1
+    # Hits don't report the original call's spend.
+    assert first.usage == {"total_tokens": 10} and second.usage == {}
+
+    # A different request misses; sampled requests are never cached.
+    await cache.get_or_call(chat, temperature=0.0, **{**req, "max_tokens": 128})
+    await cache.get_or_call(chat, temperature=0.7, **req)
+    await cache.get_or_call(chat, temperature=0.7, **req)
+    assert chat.calls == 4
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+async def test_llm_cache_is_bounded_and_can_be_disabled() -> None:
+    chat = _CountingChat()
+    cache = LLMCache(max_entries=1)
+    base = dict(tools=None, model="m", max_tokens=64, temperature=0.0)
+
+    await cache.get_or_call(chat, messages=[{"role": "user", "content": "a"}], **base)
+    await cache.get_or_call(chat, messages=[{"role": "user", "content": "b"}], **base)
+    await cache.get_or_call(chat, messages=[{"role": "user", "content": "a"}], **base)
+    assert chat.calls == 3
+
+    off = LLMCache(max_entries=0)
+    await off.get_or_call(chat, messages=[], **base)
+    await off.get_or_call(chat, messages=[], **base)
+    assert chat.calls == 5
+
+
+async def test_llm_cache_entries_expire(monkeypatch) -> None:
+    now = [100.0]
+    monkeypatch.setattr("nanobot.agent.llm_cache.time.monotonic", lambda: now[0])
+    chat = _CountingChat()
+    cache = LLMCache(max_entries=4, ttl_s=60)
+    req = dict(messages=[], tools=None, model="m", max_tokens=64, temperature=0.0)
+
+    await cache.get_or_call(chat, **req)
+    now[0] += 59
+    await cache.get_or_call(chat, **req)
+    assert chat.calls == 1
+
+    now[0] += 2
+    await cache.get_or_call(chat, **req)
+    assert chat.calls == 2
+
+
+async def test_llm_cache_coalesces_concurrent_identical_requests() -> None:
+    release = asyncio.Event()
+    chat = _CountingChat()
+
+    async def slow_chat(**kwargs: Any) -> LLMResponse:
+        await release.wait()
+        return await chat(**kwargs)
+
+    cache = LLMCache()
+    req = dict(messages=[], tools=None, model="m", max_tokens=64, temperature=0.0)
+    first = asyncio.create_task(cache.get_or_call(slow_chat, **req))
+    second = asyncio.create_task(cache.get_or_call(slow_chat, **req))
+    await asyncio.sleep(0)
+    release.set()
+
+    first, second = await first, await second
+    assert first.content == second.content and chat.calls == 1
+    assert first.usage and not second.usage
+
+
+async def test_llm_cache_waiter_retries_when_shared_call_is_cancelled() -> None:
+    started = asyncio.Event()
+    chat = _CountingChat()
+
+    async def hanging_chat(**kwargs: Any) -> LLMResponse:
+        started.set()
+        await asyncio.Event().wait()
+        raise AssertionError("unreachable")
+
+    cache = LLMCache()
+    req = dict(messages=[], tools=None, model="m", max_tokens=64, temperature=0.0)
+    owner = asyncio.create_task(cache.get_or_call(hanging_chat, **req))
+    await started.wait()
+    waiter = asyncio.create_task(cache.get_or_call(chat, **req))
+    await asyncio.sleep(0)
+
+    owner.cancel()
+    # The other turn makes its own call instead of being cancelled with the owner.
+    assert (await waiter).content == "reply-1"
+    assert owner.cancelled() and chat.calls == 1
+
+
+async def test_agent_loop_does_not_charge_cache_hits(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(pathlib.Path, "home", classmethod(lambda cls: tmp_path))
+    chat = _CountingChat()
+
+    class _Provider(LLMProvider):
+        async def chat(self, **kwargs: Any) -> LLMResponse:
+            resp = await chat(**kwargs)
+            resp.usage = {"prompt_tokens": 100, "completion_tokens": 5, "cost": 0.01}
+            return resp
+
+        def get_default_model(self) -> str:
+            return "test-model"
+
+    cfg = AgentDefaults(temperature=0.0)
+    loop = AgentLoop(
+        bus=MessageBus(), provider=_Provider(api_key=None), workspace=tmp_path, agent_config=cfg
+    )
+    session = loop.sessions.get_or_create("cli:c")
+    for _ in range(2):
+        await loop._run_tool_loop(
+            session=session,
+            messages=[{"role": "system", "content": "s"}, {"role": "user", "content": "hi"}],
+            tools=loop.tools,
+            tool_error_backoff_message="",
+            no_response_message="",
+            channel="cli",
+            chat_id="c",
+            verbosity="normal",
+        )
+
+    assert chat.calls == 1 and loop._llm_cache.hits == 1
+    assert session.metadata["session_cost"] == 0.01
+    assert len(session.metadata["usage_history"]) == 1
@@ -15,3 +15,53 @@ def test_memory_db_ingest_and_search(tmp_path) -> None:
     assert hits, "expected at least one hit"
     assert any("cat" in h.content.lower() for h in hits)
 
+
+def test_memory_db_search_multi_limits_per_scope(tmp_path) -> None:
+    db = MemoryDB(tmp_path / "memory.sqlite3")
+    a = tmp_path / "a.md"
+    b = tmp_path / "b.md"
+    a.write_text("\n\n".join(f"Cats note number {i} in A." for i in range(5)), encoding="utf-8")
+    b.write_text("Cats note only in scope B.", encoding="utf-8")
+
+    db.ingest_many([("sa", "a", a), ("sb", "b", b)])
+    hits = db.search_multi(scopes=["sb", "sa"], query_text="cats", limit_per_scope=2)
+
+    assert [h.scope for h in hits] == ["sb", "sa", "sa"]
+
+
+def test_memory_db_search_truncates_in_sql(tmp_path) -> None:
+    db = MemoryDB(tmp_path / "memory.sqlite3")
+    note = tmp_path / "note.md"
+    note.write_text("cats " + "x" * 600, encoding="utf-8")
+
+    db.ingest_file_if_changed(scope="s1", source_key="note", path=note)
+    (hit,) = db.search(scope="s1", query_text="cats", limit=5, max_chars=400)
+
+    assert hit.content == ("cats " + "x" * 600)[:400] + "..."
+
+
+def test_fts_query_drops_stopwords_and_duplicates() -> None:
+    from nanobot.agent.memory_db import _fts_query_from_text
+
+    q = _fts_query_from_text(
+        "Could you please tell me about Zorbulator AND the zorbulator NEAR launch?"
+    )
+    assert q == "tell OR zorbulator OR near OR launch"
+    assert _fts_query_from_text("thanks, you too!") == "too"
+    assert _fts_query_from_text("ok thanks") == ""
+    # Two-character tokens never take a slot under the term cap.
+    assert _fts_query_from_text("is it in my db? do go tests fail") == "tests OR fail"
+
+
+def test_ingest_many_skips_unchanged_files_without_sqlite(tmp_path, monkeypatch) -> None:
+    db = MemoryDB(tmp_path / "memory.sqlite3")
+    note = tmp_path / "note.md"
+    note.write_text("Cats are great animals.", encoding="utf-8")
+    db.ingest_many([("s1", "note", note)])
+    assert db._connect() is db._connect()
+
+    def _no_db():  # pragma: no cover
+        raise AssertionError("unchanged files should not touch SQLite")
+
+    monkeypatch.setattr(db, "_connect", _no_db)
+    db.ingest_many([("s1", "note", note)])
@@ -0,0 +1,16 @@
+from nanobot.bus.events import InboundMessage
+from nanobot.bus.queue import MessageBus
+
+
+async def test_consume_inbound_batch_drains_queued_messages() -> None:
+    bus = MessageBus()
+    for i in range(5):
+        await bus.publish_inbound(
+            InboundMessage(channel="cli", sender_id="u", chat_id="c", content=str(i))
+        )
+
+    first = await bus.consume_inbound_batch(max_n=3)
+    rest = await bus.consume_inbound_batch(max_n=3)
+    assert [m.content for m in first] == ["0", "1", "2"]
+    assert [m.content for m in rest] == ["3", "4"]
+    assert bus.inbound_size == 0
@@ -154,3 +154,16 @@ async def test_message_tool_context_is_request_scoped(tmp_path, monkeypatch, con
         ("cli", "cB", "hello-B"),
     }
 
+
+async def test_agent_stop_interrupts_idle_run_immediately(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(pathlib.Path, "home", classmethod(lambda cls: tmp_path))
+
+    bus = MessageBus()
+    loop = AgentLoop(bus=bus, provider=_BarrierProvider(), workspace=tmp_path)
+    agent_task = asyncio.create_task(loop.run())
+    await asyncio.sleep(0)  # let run() block on the inbound queue
+
+    loop.stop()
+    # No polling interval to wait out: run() returns on the next loop turn.
+    await asyncio.wait_for(agent_task, timeout=0.2)
+    assert bus.inbound_size == 0
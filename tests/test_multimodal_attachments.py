@@ -32,3 +32,43 @@ def test_build_user_content_falls_back_to_text_when_no_supported_media(tmp_path)
     content = cb._build_user_content("hello", [str(txt)])
     assert content == "hello"
 
+
+def test_build_user_content_encodes_large_media_in_chunks(tmp_path) -> None:
+    import base64
+
+    cb = ContextBuilder(tmp_path)
+    img = tmp_path / "a.png"
+    data = bytes(range(256)) * 1000  # Spans several encoder chunks.
+    img.write_bytes(data)
+
+    content = cb._build_user_content("hello", [str(img)])
+    assert content[1]["image_url"]["url"] == (
+        "data:image/png;base64," + base64.b64encode(data).decode()
+    )
+
+
+def test_build_user_content_keeps_attachment_order(tmp_path) -> None:
+    cb = ContextBuilder(tmp_path)
+    paths = []
+    for i, ext in enumerate(["png", "pdf", "jpg", "pdf"]):
+        p = tmp_path / f"f{i}.{ext}"
+        p.write_bytes(bytes([i]) * 10)
+        paths.append(str(p))
+
+    content = cb._build_user_content("hi", paths)
+    kinds = [part["type"] for part in content[1:]]
+    assert kinds == ["image_url", "file", "image_url", "file"]
+    assert content[2]["file"]["filename"] == "f1.pdf"
+    assert content[4]["file"]["filename"] == "f3.pdf"
+
+
+def test_build_user_content_matches_suffix_case_insensitively(tmp_path) -> None:
+    cb = ContextBuilder(tmp_path)
+    upper = tmp_path / "PHOTO.JPG"
+    upper.write_bytes(b"jpeg")
+    bmp = tmp_path / "legacy.bmp"
+    bmp.write_bytes(b"bmp")
+
+    content = cb._build_user_content("hi", [str(upper), str(bmp)])
+    assert len(content) == 2
+    assert content[1]["image_url"]["url"].startswith("data:image/jpeg;base64,")
@@ -80,6 +80,7 @@ async def test_chat_parses_tool_calls(monkeypatch):
     assert tc.id == "call_123"
     assert tc.name == "read_file"
     assert tc.arguments == {"path": "/tmp/x.txt"}
+    assert tc.raw_arguments == '{"path": "/tmp/x.txt"}'
     await provider.close()
 
 
@@ -136,6 +137,24 @@ async def test_tools_included_in_request(monkeypatch):
     await provider.close()
 
 
+@pytest.mark.asyncio
+async def test_prompt_cache_key_sent_only_when_given(monkeypatch):
+    captured: list[dict[str, Any]] = []
+
+    async def fake_post(self, url, **kwargs):
+        captured.append(kwargs.get("json", {}))
+        return FakeResponse(200, _success_response())
+
+    monkeypatch.setattr(httpx.AsyncClient, "post", fake_post)
+
+    provider = OpenRouterProvider(api_key="k1", default_model="m")
+    await provider.chat(messages=[{"role": "user", "content": "hi"}], prompt_cache_key="abc")
+    await provider.chat(messages=[{"role": "user", "content": "hi"}])
+    assert captured[0]["prompt_cache_key"] == "abc"
+    assert "prompt_cache_key" not in captured[1]
+    await provider.close()
+
+
 @pytest.mark.asyncio
 async def test_rate_limit_error_is_retryable(monkeypatch):
     async def fake_post(self, url, **kwargs):
@@ -280,3 +299,67 @@ async def test_cost_none_when_not_returned(monkeypatch):
 
 async def _noop():
     pass
+
+
+def _sse(*chunks: dict[str, Any]) -> bytes:
+    events = [": OPENROUTER PROCESSING"] + [f"data: {json.dumps(c)}" for c in chunks]
+    return ("\n\n".join(events + ["data: [DONE]"]) + "\n\n").encode()
+
+
+def _args_chunk(arguments: str) -> dict[str, Any]:
+    return {"index": 0, "function": {"arguments": arguments}}
+
+
+@pytest.mark.asyncio
+async def test_chat_stream_emits_deltas_and_assembles_response():
+    sent: list[dict[str, Any]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(json.loads(request.content))
+        call = {"index": 0, "id": "c1", "function": {"name": "read_file"}}
+        body = _sse(
+            {"choices": [{"delta": {"content": "Hel"}}]},
+            {"choices": [{"delta": {"content": "lo"}}]},
+            {"choices": [{"delta": {"tool_calls": [call]}}]},
+            {"choices": [{"delta": {"tool_calls": [_args_chunk('{"path":')]}}]},
+            {
+                "choices": [
+                    {"delta": {"tool_calls": [_args_chunk('"a"}')]}, "finish_reason": "tool_calls"}
+                ]
+            },
+            {"choices": [], "usage": {"prompt_tokens": 3, "completion_tokens": 2}},
+        )
+        return httpx.Response(200, content=body)
+
+    provider = OpenRouterProvider(api_key="k1", default_model="test/model")
+    provider._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    deltas: list[str] = []
+
+    resp = await provider.chat_stream(
+        messages=[{"role": "user", "content": "hi"}], on_delta=deltas.append
+    )
+    assert sent[0]["stream"] is True
+    assert deltas == ["Hel", "lo"]
+    assert resp.content == "Hello"
+    assert resp.finish_reason == "tool_calls"
+    assert resp.usage["prompt_tokens"] == 3
+    assert [(tc.id, tc.name, tc.arguments) for tc in resp.tool_calls] == [
+        ("c1", "read_file", {"path": "a"})
+    ]
+    assert resp.tool_calls[0].raw_arguments == '{"path":"a"}'
+    await provider.close()
+
+
+@pytest.mark.asyncio
+async def test_chat_stream_raises_llm_error_on_http_error():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(401, json={"error": {"message": "bad key"}})
+
+    provider = OpenRouterProvider(api_key="k1", default_model="test/model")
+    provider._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    with pytest.raises(LLMError) as exc_info:
+        await provider.chat_stream(messages=[{"role": "user", "content": "hi"}], on_delta=print)
+    assert exc_info.value.status_code == 401
+    assert "bad key" in exc_info.value.message
+    await provider.close()
@@ -40,6 +40,19 @@ def test_bootstrap_cache_invalidates_on_mtime_change(tmp_path) -> None:
     assert second != first
 
 
+def test_bootstrap_cache_tracks_created_and_deleted_files(tmp_path) -> None:
+    builder = ContextBuilder(tmp_path)
+    builder.BOOTSTRAP_FILES = ["AGENTS.md", "SOUL.md"]
+    assert builder._get_bootstrap_content() == ""
+
+    soul = tmp_path / "SOUL.md"
+    soul.write_text("soul", encoding="utf-8")
+    assert builder._get_bootstrap_content() == "## SOUL.md\n\nsoul"
+
+    soul.unlink()
+    assert builder._get_bootstrap_content() == ""
+
+
 def test_memory_context_caches_expensive_reads(tmp_path) -> None:
     # Memory is retrieved per request (query-time) and scoped by session to avoid cross-chat leakage.
     mem_dir = tmp_path / "memory"
@@ -97,3 +110,198 @@ def test_skills_summary_cache_invalidates_on_skill_mtime(tmp_path) -> None:
     s3 = builder._get_skills_summary()
     assert s3 == "summary-2"
     assert builder.skills.calls == 2
+
+
+def test_system_prompt_keeps_static_prefix_first(tmp_path) -> None:
+    (tmp_path / "AGENTS.md").write_text("agent rules", encoding="utf-8")
+    mem_dir = tmp_path / "memory"
+    mem_dir.mkdir(parents=True, exist_ok=True)
+    (mem_dir / "MEMORY.md").write_text("Global: favourite colour is teal.", encoding="utf-8")
+
+    builder = ContextBuilder(tmp_path)
+    builder.BOOTSTRAP_FILES = ["AGENTS.md"]
+
+    p1 = builder.build_system_prompt(session_key="cli:x", current_message="colour", history=[])
+    p2 = builder.build_system_prompt(session_key="cli:y", current_message="hello", history=[])
+
+    # Bootstrap comes before per-request memory/time so the prefix stays byte-identical.
+    assert p1.index("agent rules") < p1.index("teal") < p1.index("## Current Time")
+    prefix = p1[: p1.index("teal")]
+    assert p2.startswith(prefix[: prefix.rindex("---")])
+
+
+def test_stable_prefix_reused_until_sections_change(tmp_path) -> None:
+    agents = tmp_path / "AGENTS.md"
+    agents.write_text("rules v1", encoding="utf-8")
+    builder = ContextBuilder(tmp_path)
+    builder.BOOTSTRAP_FILES = ["AGENTS.md"]
+
+    s1, _ = builder._build_system_prompt_parts(None, session_key="cli:x", current_message="a")
+    s2, _ = builder._build_system_prompt_parts(None, session_key="cli:y", current_message="b")
+    assert s2 is s1
+
+    agents.write_text("rules v2", encoding="utf-8")
+    st = agents.stat()
+    os.utime(agents, (st.st_atime, st.st_mtime + 10))
+    s3, _ = builder._build_system_prompt_parts(None, session_key="cli:x", current_message="a")
+    assert "rules v2" in s3 and "rules v1" not in s3
+
+
+def test_build_messages_marks_cache_breakpoint(tmp_path) -> None:
+    builder = ContextBuilder(tmp_path, prompt_cache_control=True)
+    messages = builder.build_messages(history=[], current_message="hi", session_key="cli:x")
+
+    system = messages[0]["content"]
+    assert isinstance(system, list) and len(system) == 2
+    assert system[0]["cache_control"] == {"type": "ephemeral"}
+    assert "## Current Time" not in system[0]["text"]
+    assert "## Current Time" in system[1]["text"]
+
+    plain = ContextBuilder(tmp_path).build_messages(history=[], current_message="hi")
+    assert isinstance(plain[0]["content"], str)
+
+
+def test_memory_retrieval_cached_until_memory_file_changes(tmp_path) -> None:
+    mem_file = tmp_path / "memory" / "MEMORY.md"
+    mem_file.parent.mkdir(parents=True, exist_ok=True)
+    mem_file.write_text("Global: the launch code is Zorbulator.", encoding="utf-8")
+
+    builder = ContextBuilder(tmp_path)
+    calls = {"search": 0}
+    real_search = builder.memory_db.search_multi
+
+    def _counting_search(**kwargs):
+        calls["search"] += 1
+        return real_search(**kwargs)
+
+    builder.memory_db.search_multi = _counting_search
+
+    kwargs = dict(session_key=None, memory_scope="global", memory_key=None, history=[])
+    first = builder._get_memory_section(current_message="Zorbulator", **kwargs)
+    second = builder._get_memory_section(current_message="Zorbulator", **kwargs)
+    assert "Zorbulator" in first and second == first
+    assert calls["search"] == 1
+
+    mem_file.write_text("Global: the launch code is Quasar.", encoding="utf-8")
+    st = mem_file.stat()
+    os.utime(mem_file, (st.st_atime, st.st_mtime + 10))
+
+    third = builder._get_memory_section(current_message="Zorbulator launch", **kwargs)
+    assert "Quasar" in third
+    assert calls["search"] == 2
+
+    # Empty results are cached too, until explicitly invalidated.
+    assert builder._get_memory_section(current_message="chitchat", **kwargs) == ""
+    assert builder._get_memory_section(current_message="chitchat", **kwargs) == ""
+    assert calls["search"] == 3
+    builder.invalidate_memory_cache()
+    builder._get_memory_section(current_message="chitchat", **kwargs)
+    assert calls["search"] == 4
+
+
+def test_bootstrap_reads_only_the_budgeted_head(tmp_path) -> None:
+    (tmp_path / "AGENTS.md").write_text("A" * 50_000, encoding="utf-8")
+    (tmp_path / "SOUL.md").write_text("never read", encoding="utf-8")
+
+    builder = ContextBuilder(tmp_path, bootstrap_max_chars=100)
+    builder.BOOTSTRAP_FILES = ["AGENTS.md", "SOUL.md"]
+
+    text = builder._get_bootstrap_content()
+    assert text.startswith("[truncated bootstrap to first 100 chars]\n## AGENTS.md")
+    assert len(text.split("\n", 1)[1]) == 100
+    assert "never read" not in text
+
+
+def test_section_cache_is_bounded_lru(tmp_path) -> None:
+    builder = ContextBuilder(tmp_path)
+    limit = builder._SECTION_CACHE_MAX_ENTRIES
+
+    builder._set_cache("requested_skills", b"a", "A")
+    builder._set_cache("requested_skills", b"b", "B")
+    # Alternating variants of one section both stay cached.
+    assert builder._get_cached("requested_skills", b"a") == "A"
+    assert builder._get_cached("requested_skills", b"b") == "B"
+
+    for i in range(limit):
+        builder._set_cache("bootstrap", i, str(i))
+    assert len(builder._cache) == limit
+    assert builder._get_cached("requested_skills", b"a") is None
+    assert builder._get_cached("bootstrap", limit - 1) == str(limit - 1)
+
+
+def test_identity_tail_cached_per_minute_and_scope(tmp_path, monkeypatch) -> None:
+    import nanobot.agent.context as context_mod
+
+    builder = ContextBuilder(tmp_path)
+    clock = {"t": 1_700_000_000.0}
+    monkeypatch.setattr(context_mod.time, "time", lambda: clock["t"])
+
+    a1 = builder._get_identity_dynamic(session_key="cli:a")
+    assert builder._get_identity_dynamic(session_key="cli:a") is a1
+    assert "cli:b" in builder._get_identity_dynamic(session_key="cli:b")
+
+    clock["t"] += 60
+    a2 = builder._get_identity_dynamic(session_key="cli:a")
+    assert a2 != a1 and a2.replace(a2.split("\n")[1], "") == a1.replace(a1.split("\n")[1], "")
+
+
+def test_identity_tail_does_not_evict_section_cache(tmp_path, monkeypatch) -> None:
+    import nanobot.agent.context as context_mod
+
+    builder = ContextBuilder(tmp_path)
+    clock = {"t": 1_700_000_000.0}
+    monkeypatch.setattr(context_mod.time, "time", lambda: clock["t"])
+    builder._set_cache("bootstrap", 0, "B")
+
+    for i in range(builder._SECTION_CACHE_MAX_ENTRIES * 2):
+        builder._get_identity_dynamic(session_key=f"cli:{i}")
+
+    assert builder._get_cached("bootstrap", 0) == "B"
+    # Only the current minute's tails are kept.
+    clock["t"] += 60
+    builder._get_identity_dynamic(session_key="cli:0")
+    assert len(builder._identity_cache) == 1
+
+
+def test_memory_section_skips_search_on_fresh_workspace(tmp_path) -> None:
+    builder = ContextBuilder(tmp_path)
+    calls = {"search": 0}
+    real_search = builder.memory_db.search_multi
+
+    def _counting_search(**kwargs):
+        calls["search"] += 1
+        return real_search(**kwargs)
+
+    builder.memory_db.search_multi = _counting_search
+    kwargs = dict(session_key="cli:x", memory_scope="session", memory_key=None, history=[])
+
+    assert builder._get_memory_section(current_message="anything", **kwargs) == ""
+    assert calls["search"] == 0
+
+    mem_dir = tmp_path / "memory"
+    mem_dir.mkdir(parents=True, exist_ok=True)
+    (mem_dir / "MEMORY.md").write_text("Global: the ship is called Rocinante.", encoding="utf-8")
+    assert "Rocinante" in builder._get_memory_section(current_message="ship name", **kwargs)
+    assert calls["search"] == 1
+
+
+def test_prompt_cache_key_covers_only_the_stable_prefix(tmp_path, monkeypatch) -> None:
+    from nanobot.agent.loop import AgentLoop
+    from nanobot.bus.queue import MessageBus
+    from nanobot.config.schema import AgentDefaults
+    from nanobot.providers.openrouter_provider import OpenRouterProvider
+
+    monkeypatch.setattr(Path, "home", classmethod(lambda cls: tmp_path))
+    provider = OpenRouterProvider(api_key="k", default_model="m")
+    cfg = AgentDefaults(prompt_cache_control=True)
+    loop = AgentLoop(bus=MessageBus(), provider=provider, workspace=tmp_path, agent_config=cfg)
+    defs = loop.tools.get_definitions()
+
+    a = loop.context.build_messages(history=[], current_message="one", session_key="cli:a")
+    b = loop.context.build_messages(history=[], current_message="two", session_key="cli:b")
+    key = loop._prompt_cache_key(a, defs)
+    assert key and key == loop._prompt_cache_key(b, defs)
+    assert loop._prompt_cache_key(a, defs[:1]) != key
+
+    loop.context.prompt_cache_control = False
+    assert loop._prompt_cache_key(a, defs) is None
@@ -1,4 +1,8 @@
-from nanobot.session.manager import Session
+import asyncio
+import pathlib
+import threading
+
+from nanobot.session.manager import Session, SessionManager
 
 
 def test_get_history_trims_old_messages() -> None:
@@ -42,3 +46,97 @@ def test_get_history_boundary_does_not_trim() -> None:
         "msg-2",
         "msg-3",
     ]
+
+
+def test_get_history_reuses_converted_entries() -> None:
+    session = Session(key="test")
+    session.add_message("user", "hi", media=["a.png"])
+    first = session.get_history()
+    session.add_message("assistant", "hello")
+    second = session.get_history()
+
+    assert first[0] == {"role": "user", "content": "hi", "media": ["a.png"]}
+    assert second[0] is first[0]
+    assert second[1] == {"role": "assistant", "content": "hello"}
+
+    session.clear()
+    assert session.get_history() == []
+
+
+async def test_get_or_create_async_loads_once_and_shares_cache(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(pathlib.Path, "home", classmethod(lambda cls: tmp_path))
+    mgr = SessionManager(workspace=tmp_path)
+    saved = Session(key="cli:a")
+    saved.add_message("user", "hello")
+    mgr.save(saved)
+    mgr._cache.clear()
+
+    loaded = await mgr.get_or_create_async("cli:a")
+    assert [m["content"] for m in loaded.messages] == ["hello"]
+    assert await mgr.get_or_create_async("cli:a") is loaded
+    assert mgr.get_or_create("cli:a") is loaded
+    assert (await mgr.get_or_create_async("cli:new")).messages == []
+
+
+async def test_save_background_coalesces_and_flushes(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(pathlib.Path, "home", classmethod(lambda cls: tmp_path))
+    mgr = SessionManager(workspace=tmp_path)
+    writes: list[int] = []
+    real_save = mgr._save_to_disk
+    monkeypatch.setattr(
+        mgr, "_save_to_disk", lambda s: (writes.append(len(s.messages)), real_save(s))
+    )
+
+    session = Session(key="cli:bg")
+    for i in range(3):
+        session.add_message("user", f"msg-{i}")
+        mgr.save_background(session)
+    await mgr.flush()
+
+    # The task only runs once we yield, so all three calls collapse into one write.
+    assert writes == [3]
+    mgr._cache.clear()
+    assert [m["content"] for m in mgr.get_or_create("cli:bg").messages] == [
+        "msg-0",
+        "msg-1",
+        "msg-2",
+    ]
+
+
+async def test_save_background_does_not_resurrect_deleted_session(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(pathlib.Path, "home", classmethod(lambda cls: tmp_path))
+    mgr = SessionManager(workspace=tmp_path)
+    started, release = threading.Event(), threading.Event()
+    real_save = mgr._save_to_disk
+
+    def _slow_save(s: Session) -> None:
+        started.set()
+        release.wait(5)
+        real_save(s)
+
+    monkeypatch.setattr(mgr, "_save_to_disk", _slow_save)
+    session = Session(key="cli:gone")
+    session.add_message("user", "hello")
+    mgr.save_background(session)
+    await asyncio.to_thread(started.wait, 5)
+
+    mgr.delete("cli:gone")
+    release.set()
+    await mgr.flush()
+    assert not mgr._get_session_path("cli:gone").exists()
+
+
+async def test_save_background_writes_the_current_cached_session(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(pathlib.Path, "home", classmethod(lambda cls: tmp_path))
+    mgr = SessionManager(workspace=tmp_path)
+    old = Session(key="cli:swap")
+    old.add_message("user", "old")
+    mgr.save_background(old)
+
+    new = Session(key="cli:swap")
+    new.add_message("user", "new")
+    mgr._cache["cli:swap"] = new
+    await mgr.flush()
+
+    mgr._cache.clear()
+    assert [m["content"] for m in mgr.get_or_create("cli:swap").messages] == ["new"]
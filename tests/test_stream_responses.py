@@ -0,0 +1,71 @@
+import pathlib
+from typing import Any
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.bus.events import InboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.config.schema import AgentDefaults
+from nanobot.providers.base import DeltaCallback, LLMProvider, LLMResponse
+
+
+class _StreamingProvider(LLMProvider):
+    def __init__(self) -> None:
+        super().__init__(api_key=None, api_base=None)
+        self.streamed = 0
+
+    async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+        return LLMResponse(content="Hello there")
+
+    async def chat_stream(
+        self, messages: list[dict[str, Any]], *, on_delta: DeltaCallback, **kwargs: Any
+    ) -> LLMResponse:
+        self.streamed += 1
+        for part in ("Hello", " there"):
+            on_delta(part)
+        return LLMResponse(content="Hello there")
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+
+def _drain(bus: MessageBus) -> list[tuple[str, str]]:
+    out = []
+    while bus.outbound_size:
+        msg = bus.outbound.get_nowait()
+        kind = msg.metadata.get("type", "assistant")
+        if msg.metadata.get("data", {}).get("reset"):
+            kind += ":reset"
+        out.append((kind, msg.content))
+    return out
+
+
+async def test_stream_responses_publishes_deltas_before_reply(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(pathlib.Path, "home", classmethod(lambda cls: tmp_path))
+    bus = MessageBus()
+    provider = _StreamingProvider()
+    cfg = AgentDefaults(stream_responses=True)
+    loop = AgentLoop(bus=bus, provider=provider, workspace=tmp_path, agent_config=cfg)
+
+    msg = InboundMessage(channel="webui", sender_id="u", chat_id="c", content="hi")
+    out = await loop._process_message(msg)
+    assert out is not None and out.content == "Hello there"
+    assert _drain(bus) == [("delta:reset", ""), ("delta", "Hello"), ("delta", " there")]
+
+    # CLI turns have nobody rendering partial text, so they don't stream.
+    await loop.process_direct("hi again")
+    assert provider.streamed == 1
+    assert _drain(bus) == []
+    await loop.sessions.flush()
+
+
+async def test_stream_responses_off_by_default(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(pathlib.Path, "home", classmethod(lambda cls: tmp_path))
+    bus = MessageBus()
+    provider = _StreamingProvider()
+    loop = AgentLoop(bus=bus, provider=provider, workspace=tmp_path)
+
+    msg = InboundMessage(channel="webui", sender_id="u", chat_id="c", content="hi")
+    await loop._process_message(msg)
+    assert provider.streamed == 0
+    assert _drain(bus) == []
+    await loop.sessions.flush()
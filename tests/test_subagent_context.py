@@ -92,3 +92,16 @@ def test_subagent_prompt_without_context_builder(tmp_path: Path) -> None:
     # Should NOT contain enrichment sections
     assert "# Skills" not in prompt
     assert "# Conversation Context" not in prompt
+
+
+def test_subagent_prompt_explains_toon_tool_results(tmp_path: Path) -> None:
+    """With toolSerializer="toon" the subagent gets the TOON format note."""
+    from nanobot.agent.toon import TOON_PROMPT_NOTE
+
+    builder = ContextBuilder(tmp_path, tool_serializer="toon")
+    mgr = _make_manager(tmp_path, context_builder=builder)
+
+    assert TOON_PROMPT_NOTE in mgr._build_subagent_prompt("List the users")
+    assert TOON_PROMPT_NOTE not in _make_manager(
+        tmp_path, context_builder=ContextBuilder(tmp_path)
+    )._build_subagent_prompt("List the users")
@@ -346,6 +346,39 @@ async def test_subagent_tool_log(tmp_path: Path) -> None:
     assert "timestamp" in meta["tool_log"][0]
 
 
+async def test_subagent_tool_results_use_context_builder_cap(tmp_path: Path) -> None:
+    """Tool results should be size-capped like the main loop when a builder is given."""
+    from nanobot.agent.context import ContextBuilder
+    from nanobot.agent.tools.registry import ToolRegistry
+
+    class _BigTool(_OkTool):
+        async def execute(self, **kwargs: Any) -> str:
+            return "x" * 5000
+
+    provider = _SeqProvider([
+        LLMResponse(
+            content=None,
+            tool_calls=[ToolCallRequest(id="t1", name="ok_tool", arguments={})],
+        ),
+        LLMResponse(content="done", tool_calls=[]),
+    ])
+    mgr = _make_manager(tmp_path, provider)
+    mgr._context_builder = ContextBuilder(tmp_path, tool_result_max_chars=1000)
+
+    tools = ToolRegistry()
+    tools.register(_BigTool())
+    messages: list[dict[str, Any]] = [
+        {"role": "system", "content": "test"},
+        {"role": "user", "content": "do something"},
+    ]
+
+    await mgr._run_tool_loop("test-task", messages, tools)
+
+    tool_msg = next(m for m in messages if m["role"] == "tool")
+    assert len(tool_msg["content"]) < 1100
+    assert "chars omitted" in tool_msg["content"]
+
+
 # ---------------------------------------------------------------------------
 # Phase 2A: Metadata pruning
 # ---------------------------------------------------------------------------
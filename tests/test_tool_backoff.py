@@ -187,6 +187,23 @@ async def test_system_message_uses_lightweight_announce(tmp_path, monkeypatch) -
     assert out.content == "Here is the summary."
 
 
+async def test_system_message_loads_session_off_the_event_loop(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(pathlib.Path, "home", classmethod(lambda cls: tmp_path))
+
+    bus = MessageBus()
+    provider = _SeqProvider([LLMResponse(content="Done.", tool_calls=[])])
+    loop = AgentLoop(bus=bus, provider=provider, workspace=tmp_path, agent_config=AgentDefaults())
+
+    def _blocking_load(key: str):  # pragma: no cover
+        raise AssertionError("system messages must use get_or_create_async")
+
+    monkeypatch.setattr(loop.sessions, "get_or_create", _blocking_load)
+    msg = InboundMessage(channel="system", sender_id="subagent", chat_id="cli:c", content="x")
+    out = await loop._process_message(msg)
+
+    assert out is not None and out.content == "Done."
+
+
 async def test_tool_error_backoff_counts_warnings(tmp_path, monkeypatch) -> None:
     monkeypatch.setattr(pathlib.Path, "home", classmethod(lambda cls: tmp_path))
 
@@ -217,3 +234,49 @@ async def test_tool_error_backoff_counts_warnings(tmp_path, monkeypatch) -> None
         "Please rephrase or provide more specific inputs."
         "\n\nLast tool error (warn_tool): Warning: ambiguous input"
     )
+
+
+def test_request_tools_share_stateless_tools_but_not_message_tool(tmp_path: pathlib.Path) -> None:
+    bus = MessageBus()
+    provider = _SeqProvider([])
+    loop = AgentLoop(bus=bus, provider=provider, workspace=tmp_path, agent_config=AgentDefaults())
+
+    a = loop._build_tools_for_request(
+        channel="cli", chat_id="a", allowed_tools=None, restrict_workspace=True
+    )
+    b = loop._build_tools_for_request(
+        channel="cli", chat_id="b", allowed_tools=None, restrict_workspace=True
+    )
+    c = loop._build_tools_for_request(
+        channel="cli", chat_id="c", allowed_tools=None, restrict_workspace=False
+    )
+
+    assert a.get("exec") is b.get("exec")
+    assert a.get("message") is not b.get("message")
+    assert a.get("read_file").restrict_to_workspace is True
+    # restrict_to_workspace in the exec config pins overrides to True, so c shares a's set.
+    assert c.get("read_file") is a.get("read_file")
+    # Sessions without an override get the base registry's tools: the same instances again.
+    d = loop._build_tools_for_request(
+        channel="cli", chat_id="d", allowed_tools=None, restrict_workspace=None
+    )
+    assert d.get("exec") is a.get("exec") is loop.tools.get("exec")
+
+
+def test_request_tools_cached_per_chat_until_base_tools_change(tmp_path: pathlib.Path) -> None:
+    cfg = AgentDefaults()
+    loop = AgentLoop(bus=MessageBus(), provider=_SeqProvider([]), workspace=tmp_path, agent_config=cfg)
+
+    def build(chat_id: str, allowed: list[str] | None = None):
+        return loop._build_tools_for_request(
+            channel="cli", chat_id=chat_id, allowed_tools=allowed, restrict_workspace=None
+        )
+
+    a = build("a")
+    assert build("a") is a
+    assert build("b") is not a
+    assert build("a", ["read_file"]) is not a
+
+    loop.tools.register(_AlwaysErrorTool())
+    fresh = build("a")
+    assert fresh is not a and fresh.has("always_error")
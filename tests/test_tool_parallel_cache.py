@@ -4,7 +4,7 @@ from pathlib import Path
 from typing import Any
 
 from nanobot.agent.tools.base import Tool
-from nanobot.agent.tools.filesystem import ReadFileTool
+from nanobot.agent.tools.filesystem import ListDirTool, ReadFileTool, WriteFileTool
 from nanobot.agent.tools.registry import ToolRegistry
 from nanobot.providers.base import ToolCallRequest
 
@@ -125,6 +125,40 @@ async def test_registry_parallelizes_consecutive_parallel_safe_calls() -> None:
     assert results == ["ok-1", "ok-2"]
 
 
+def test_read_only_filesystem_tools_are_parallel_safe(tmp_path) -> None:
+    reg = ToolRegistry()
+    for tool in (ReadFileTool(tmp_path), ListDirTool(tmp_path), WriteFileTool(tmp_path)):
+        reg.register(tool)
+    assert reg._tool_parallel_safe("read_file") and reg._tool_parallel_safe("list_dir")
+    assert not reg._tool_parallel_safe("write_file")
+
+
+async def test_registry_runs_identical_parallel_calls_once() -> None:
+    reg = ToolRegistry()
+    tool = _CountingTool()
+    tool.cacheable = False
+    tool.parallel_safe = True
+    reg.register(tool)
+
+    calls = [
+        ToolCallRequest(id="t1", name="counting", arguments={"x": 1}),
+        ToolCallRequest(id="t2", name="counting", arguments={"x": 2}),
+        ToolCallRequest(id="t3", name="counting", arguments={"x": 1}),
+    ]
+    results = await reg.execute_calls(calls, allow_parallel=True)
+    assert tool.calls == 2
+    assert results[0] == results[2] and results[1] != results[0]
+
+    tool.calls = 0
+    raw = '{"x":1}'
+    calls = [
+        ToolCallRequest(id="t1", name="counting", arguments={"x": 1}, raw_arguments=raw),
+        ToolCallRequest(id="t2", name="counting", arguments={"x": 1}, raw_arguments=raw),
+    ]
+    await reg.execute_calls(calls, allow_parallel=True)
+    assert tool.calls == 1
+
+
 async def test_registry_caches_tool_results() -> None:
     reg = ToolRegistry()
     tool = _CountingTool()
@@ -194,3 +228,38 @@ async def test_read_file_cache_invalidates_on_mtime_change(tmp_path) -> None:
     assert r2 == "new"
     assert r2 != r1
 
+
+class _DefTool(Tool):
+    def __init__(self, name: str) -> None:
+        self._name = name
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def description(self) -> str:
+        return f"{self._name} tool"
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {"type": "object", "properties": {}}
+
+    async def execute(self, **kwargs: Any) -> str:
+        return "ok"
+
+
+def test_get_definitions_is_memoized_until_registry_changes() -> None:
+    reg = ToolRegistry()
+    reg.register(_DefTool("a"))
+    reg.register(_DefTool("b"))
+
+    defs = reg.get_definitions()
+    assert reg.get_definitions() is defs
+    assert [d["function"]["name"] for d in defs] == ["a", "b"]
+
+    reg.set_allowed_tools(["b"])
+    assert [d["function"]["name"] for d in reg.get_definitions()] == ["b"]
+    reg.set_allowed_tools(None)
+    reg.unregister("a")
+    assert [d["function"]["name"] for d in reg.get_definitions()] == ["b"]
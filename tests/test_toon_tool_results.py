@@ -0,0 +1,73 @@
+import json
+
+from nanobot.agent.context import ContextBuilder
+from nanobot.agent.toon import compact_tool_result, to_toon
+
+
+def test_to_toon_uses_tabular_rows_for_uniform_objects() -> None:
+    data = {
+        "results": [
+            {"title": "Alpha", "rank": 1},
+            {"title": "Beta, two", "rank": 2},
+        ],
+        "meta": {"total": 2, "next": None},
+        "tags": ["a", "true"],
+    }
+    assert to_toon(data) == "\n".join(
+        [
+            "results[2]{title,rank}:",
+            "  Alpha,1",
+            '  "Beta, two",2',
+            "meta:",
+            "  total: 2",
+            "  next: null",
+            'tags[2]: a,"true"',
+        ]
+    )
+
+
+def test_compact_tool_result_only_rewrites_json_containers() -> None:
+    payload = json.dumps([{"id": i, "name": f"item{i}"} for i in range(5)], indent=2)
+    compact = compact_tool_result(payload)
+    assert compact.startswith("[5]{id,name}:")
+    assert len(compact) < len(payload)
+
+    assert compact_tool_result("Error: file not found") == "Error: file not found"
+    assert compact_tool_result("[not json") == "[not json"
+    assert compact_tool_result("42") == "42"
+
+
+def test_compact_tool_result_keeps_empty_containers() -> None:
+    assert compact_tool_result("{}") == "{}"
+    assert compact_tool_result("[]") == "[]"
+    assert compact_tool_result(" {  } ") == " {  } "
+
+
+def test_context_builder_applies_toon_serializer(tmp_path) -> None:
+    payload = json.dumps({"items": [{"a": 1, "b": 2}, {"a": 3, "b": 4}]})
+
+    plain = ContextBuilder(tmp_path)
+    msgs = plain.add_tool_result([], "c1", "web_search", payload)
+    assert msgs[0]["content"] == payload
+
+    toon = ContextBuilder(tmp_path, tool_serializer="toon")
+    msgs = toon.add_tool_result([], "c1", "web_search", payload)
+    assert msgs[0]["content"] == "items[2]{a,b}:\n  1,2\n  3,4"
+    assert "TOON" in toon.build_system_prompt()
+    assert "TOON" not in plain.build_system_prompt()
+
+    batch = toon.add_tool_results([], [("c1", "web_search", payload), ("c2", "exec", "ok")])
+    assert [m["tool_call_id"] for m in batch] == ["c1", "c2"]
+    assert [m["content"] for m in batch] == ["items[2]{a,b}:\n  1,2\n  3,4", "ok"]
+
+
+def test_context_builder_caps_long_tool_results(tmp_path) -> None:
+    builder = ContextBuilder(tmp_path, tool_result_max_chars=10)
+    long = "HEAD-" + "x" * 100 + "-TAIL"
+
+    msgs = builder.add_tool_results([], [("c1", "read_file", long), ("c2", "exec", "short")])
+    assert msgs[0]["content"] == "HEAD-\n[... 100 chars omitted ...]\n-TAIL"
+    assert msgs[1]["content"] == "short"
+
+    uncapped = ContextBuilder(tmp_path, tool_result_max_chars=0)
+    assert uncapped.add_tool_result([], "c1", "read_file", long)[0]["content"] == long